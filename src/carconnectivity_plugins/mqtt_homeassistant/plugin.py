@@ -1,15 +1,21 @@
 """Module implements the plugin to improve compatibility with Home Assistant."""  # pylint: disable=too-many-lines
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from enum import Enum
 import logging
 import json
+import hashlib
+import importlib.util
+import functools
+import threading
+from operator import attrgetter
 
 from carconnectivity.util import config_remove_credentials
 from carconnectivity.vehicle import GenericVehicle, ElectricVehicle
 from carconnectivity.drive import ElectricDrive, CombustionDrive, DieselDrive
 from carconnectivity.observable import Observable
+from carconnectivity.objects import GenericObject
 from carconnectivity.errors import ConfigurationError
 from carconnectivity.attributes import FloatAttribute, EnumAttribute, GenericAttribute
 from carconnectivity.position import Position
@@ -25,25 +31,339 @@ from carconnectivity_plugins.mqtt.plugin import Plugin as MqttPlugin, ImageForma
 
 from carconnectivity_plugins.mqtt_homeassistant._version import __version__
 
-# pylint: disable=duplicate-code
-SUPPORT_IMAGES: bool = False  # pylint: disable=invalid-name
-SUPPORT_IMAGES_STR: str = ""  # pylint: disable=invalid-name
+# Images are converted by the MQTT plugin, here it is only needed to know if pillow is installed. find_spec does this without importing it.
+SUPPORT_IMAGES: bool = importlib.util.find_spec('PIL') is not None
+SUPPORT_IMAGES_STR: str = "" if SUPPORT_IMAGES else "No module named 'PIL' (cannot find pillow library)"
+
 try:
-    import PIL  # pylint: disable=unused-import # noqa_F401
-    SUPPORT_IMAGES = True  # pylint: disable=invalid-name
-except ImportError as exc:
-    if str(exc) == "No module named 'PIL'":
-        SUPPORT_IMAGES_STR = str(exc) + " (cannot find pillow library)"  # pylint: disable=invalid-name
-    else:
-        SUPPORT_IMAGES_STR = str(exc)  # pylint: disable=invalid-name
-# pylint: enable=duplicate-code
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # pylint: disable=invalid-name
 
 if TYPE_CHECKING:
-    from typing import Dict, Optional, Any
+    from typing import Callable, Dict, FrozenSet, List, Optional, Any, Set, Tuple, Type
     from carconnectivity.carconnectivity import CarConnectivity
+    from carconnectivity_plugins.mqtt.mqtt_client import CarConnectivityMQTTClient
 
 LOG: logging.Logger = logging.getLogger("carconnectivity.plugins.mqtt_homeassistant")
 
+# Delay in seconds to collect bursts of enable/disable events into a single discovery publish
+DISCOVERY_DEBOUNCE_DELAY: float = 0.2
+
+# Payloads of the Home Assistant birth message, Home Assistant sends 'online' but the case of the payload is configurable there
+HOMEASSISTANT_ONLINE_PAYLOADS: FrozenSet[bytes] = frozenset({b'online', b'Online', b'ONLINE'})
+
+# Door states for which no sensor is announced
+DOOR_OPEN_STATES_WITHOUT_SENSOR: FrozenSet[Doors.OpenState] = frozenset({Doors.OpenState.UNKNOWN, Doors.OpenState.INVALID, Doors.OpenState.UNSUPPORTED})
+DOOR_LOCK_STATES_WITHOUT_SENSOR: FrozenSet[Doors.LockState] = frozenset({Doors.LockState.UNKNOWN, Doors.LockState.INVALID})
+
+# Charging and climatization states that are reported as on or off for the start/stop switches
+CHARGING_STATES_ON: FrozenSet[Charging.ChargingState] = frozenset({Charging.ChargingState.CHARGING, Charging.ChargingState.CONSERVATION,
+                                                                   Charging.ChargingState.DISCHARGING})
+CHARGING_STATES_OFF: FrozenSet[Charging.ChargingState] = frozenset({Charging.ChargingState.OFF, Charging.ChargingState.READY_FOR_CHARGING,
+                                                                    Charging.ChargingState.ERROR})
+CLIMATIZATION_STATES_ON: FrozenSet[Climatization.ClimatizationState] = frozenset({Climatization.ClimatizationState.HEATING,
+                                                                                  Climatization.ClimatizationState.COOLING,
+                                                                                  Climatization.ClimatizationState.VENTILATION})
+CLIMATIZATION_STATES_OFF: FrozenSet[Climatization.ClimatizationState] = frozenset({Climatization.ClimatizationState.OFF})
+
+# Start/stop commands for the HVAC modes set by Home Assistant
+CLIMATIZATION_MODE_COMMANDS: Dict[str, str] = {'off': 'stop', 'auto': 'start'}
+
+# Ids of the elements that extra topics are generated from (position longitude, charging and climatization state)
+EXTRA_TOPIC_ELEMENT_IDS: FrozenSet[str] = frozenset({'longitude', 'state'})
+
+# HVAC action and mode reported for each climatization state
+CLIMATIZATION_HVAC_STATES: Dict[Climatization.ClimatizationState, Tuple[str, str]] = {
+    Climatization.ClimatizationState.HEATING: ('heating', 'auto'),
+    Climatization.ClimatizationState.COOLING: ('cooling', 'auto'),
+    Climatization.ClimatizationState.VENTILATION: ('fan', 'auto'),
+    Climatization.ClimatizationState.OFF: ('off', 'off'),
+}
+
+# Origin of the discovery messages, these do not change while running
+BRIDGE_ORIGIN: Dict[str, str] = {'name': 'CarConnectivity', 'sw': __version__, 'url': 'https://github.com/tillsteinbach/CarConnectivity'}
+VEHICLE_ORIGIN: Dict[str, str] = {'name': 'carconnectivity-plugin-mqtt', 'sw': __version__,
+                                  'url': 'https://github.com/tillsteinbach/CarConnectivity-plugin-mqtt'}
+
+# Static parts of discovery components, these are copied when building a component and never modified
+UPDATE_BUTTON_TEMPLATE: Dict[str, Any] = {'p': 'button', 'icon': 'mdi:refresh', 'payload_press': 'update'}
+HEALTHY_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'device_class': 'running', 'icon': 'mdi:check',
+                                    'payload_off': 'False', 'payload_on': 'True'}
+CONNECTION_STATE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'enum', 'icon': 'mdi:lan-connect',
+                                             'payload_off': 'False', 'payload_on': 'True'}
+RANGE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'distance', 'state_class': 'measurement'}
+TANK_LEVEL_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:gas-station', 'state_class': 'measurement'}
+TANK_CAPACITY_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'volume', 'state_class': 'measurement'}
+CONSUMPTION_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'state_class': 'measurement'}
+BATTERY_CAPACITY_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'energy', 'state_class': 'measurement'}
+BATTERY_TEMPERATURE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'temperature', 'icon': 'mdi:thermometer-lines', 'state_class': 'measurement'}
+DOOR_OPEN_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'device_class': 'door', 'icon': 'mdi:car-door', 'payload_off': 'closed', 'payload_on': 'open'}
+DOOR_LOCK_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'device_class': 'lock', 'icon': 'mdi:car-door-lock',
+                                      'payload_off': 'locked', 'payload_on': 'unlocked'}
+WINDOW_OPEN_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'device_class': 'window', 'icon': 'mdi:window-open',
+                                        'payload_off': 'closed', 'payload_on': 'open'}
+LIGHT_STATE_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'icon': 'mdi:car-light-dimmed', 'payload_off': 'off', 'payload_on': 'on'}
+WINDOW_HEATING_STATE_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'icon': 'mdi:car-defrost-front', 'payload_off': 'off', 'payload_on': 'on'}
+ESTIMATED_DATE_REACHED_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'timestamp', 'icon': 'mdi:clock-end'}
+WAKEUP_BUTTON_TEMPLATE: Dict[str, Any] = {'p': 'button', 'icon': 'mdi:sleep-off', 'payload_press': 'wake'}
+SOC_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'battery', 'state_class': 'measurement'}
+ELECTRIC_CONSUMPTION_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'device_class': 'energy_distance', 'state_class': 'measurement'}
+LOCK_TEMPLATE: Dict[str, Any] = {'p': 'lock', 'icon': 'mdi:car-door-lock', 'payload_lock': 'lock', 'payload_unlock': 'unlock',
+                                 'state_locked': 'locked', 'state_unlocked': 'unlocked'}
+WINDOW_HEATING_SWITCH_TEMPLATE: Dict[str, Any] = {'p': 'switch', 'icon': 'mdi:car-defrost-front', 'payload_on': 'start', 'payload_off': 'stop',
+                                                  'state_on': 'on', 'state_off': 'off'}
+LATITUDE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:latitude', 'state_class': 'measurement'}
+LONGITUDE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:longitude', 'state_class': 'measurement'}
+CLIMATE_TEMPLATE: Dict[str, Any] = {'p': 'climate', 'icon': 'mdi:air-conditioner', 'modes': ['off', 'auto'], 'payload_on': 'start', 'payload_off': 'stop'}
+IMAGE_TEMPLATE: Dict[str, Any] = {'p': 'image', 'content_type': 'image/png'}
+CHARGING_SWITCH_TEMPLATE: Dict[str, Any] = {'p': 'switch', 'icon': 'mdi:ev-station', 'payload_on': 'start', 'payload_off': 'stop', 'state_on': 'on',
+                                            'state_off': 'off'}
+CHARGING_CONNECTOR_STATE_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:ev-station', 'device_class': 'enum'}
+CHARGING_TARGET_LEVEL_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:battery', 'state_class': 'measurement'}
+CHARGING_MAXIMUM_CURRENT_TEMPLATE: Dict[str, Any] = {'p': 'sensor', 'icon': 'mdi:speedometer', 'device_class': 'current', 'state_class': 'measurement'}
+AUTO_UNLOCK_TEMPLATE: Dict[str, Any] = {'p': 'binary_sensor', 'icon': 'mdi:lock', 'state_on': 'on', 'state_off': 'off'}
+DEVICE_TRACKER_TEMPLATE: Dict[str, Any] = {'p': 'device_tracker', 'icon': 'mdi:map-marker', 'source_type': 'gps'}
+
+
+class ComponentDescriptor(NamedTuple):
+    """
+    Description of a discovery component that only depends on a single attribute.
+
+    Attributes:
+        getter (Callable[[Any], Optional[GenericAttribute]]): Returns the attribute from the element the table is applied to.
+        suffix (str): Appended to the vehicle prefix to form the unique id of the component.
+        name (str): The name of the component.
+        template (Dict[str, Any]): The static keys of the component. Enum sensors get the options of the attribute added.
+    """
+    getter: Callable[[Any], Optional[GenericAttribute]]
+    suffix: str
+    name: str
+    template: Dict[str, Any]
+
+
+# Components applied to the vehicle
+VEHICLE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('odometer'), 'odometer', 'Odometer',
+                        {'p': 'sensor', 'icon': 'mdi:counter', 'device_class': 'distance', 'state_class': 'total'}),
+    ComponentDescriptor(attrgetter('state'), 'state', 'Vehicle State', {'p': 'sensor', 'icon': 'mdi:car-hatchback', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('connection_state'), 'connection_state', 'Connection State',
+                        {'p': 'sensor', 'icon': 'mdi:car-connected', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('outside_temperature'), 'outside_temperature', 'Outside Temperature',
+                        {'p': 'sensor', 'icon': 'mdi:sun-thermometer-outline', 'device_class': 'temperature', 'state_class': 'measurement'}),
+)
+
+# Components applied to each drive, the drive id is added to the unique id and the name
+DRIVE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('range'), 'range', 'Range', RANGE_TEMPLATE),
+    ComponentDescriptor(attrgetter('range_estimated_full'), 'range_estimated_full', 'Range at 100%', RANGE_TEMPLATE),
+    ComponentDescriptor(attrgetter('range_wltp'), 'range_wltp', 'Range WLTP', RANGE_TEMPLATE),
+)
+COMBUSTION_DRIVE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('level'), 'level', 'Tank', TANK_LEVEL_TEMPLATE),
+    ComponentDescriptor(attrgetter('consumption'), 'consumption', 'Consumption', CONSUMPTION_TEMPLATE),
+)
+FUEL_TANK_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('available_capacity'), 'available_capacity', 'Available Capacity', TANK_CAPACITY_TEMPLATE),
+)
+DIESEL_DRIVE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('adblue_level'), 'adbluelevel', 'AdBlue Tank', TANK_LEVEL_TEMPLATE),
+    ComponentDescriptor(attrgetter('adblue_range'), 'adbluerange', 'AdBlue Range', RANGE_TEMPLATE),
+    ComponentDescriptor(attrgetter('adblue_range_estimated_full'), 'adblue_range_estimated_full', 'AdBlue Range at 100%', RANGE_TEMPLATE),
+    ComponentDescriptor(attrgetter('adblue_consumption'), 'adblue_consumption', 'AdBlue Consumption', CONSUMPTION_TEMPLATE),
+)
+ADBLUE_TANK_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('available_capacity'), 'adblue_available_capacity', 'AdBlue Available Capacity', TANK_CAPACITY_TEMPLATE),
+)
+ELECTRIC_DRIVE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('level'), 'level', 'SoC', SOC_TEMPLATE),
+    ComponentDescriptor(attrgetter('consumption'), 'consumption', 'Consumption', ELECTRIC_CONSUMPTION_TEMPLATE),
+)
+BATTERY_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('temperature'), 'battery_temperature', 'Battery Temperature', BATTERY_TEMPERATURE_TEMPLATE),
+    ComponentDescriptor(attrgetter('total_capacity'), 'battery_total_capacity', 'Battery Total Capacity', BATTERY_CAPACITY_TEMPLATE),
+    ComponentDescriptor(attrgetter('available_capacity'), 'battery_available_capacity', 'Battery Available Capacity', BATTERY_CAPACITY_TEMPLATE),
+)
+
+# Components applied to vehicle.position
+POSITION_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('position_type'), 'position_type', 'Position Type', {'p': 'sensor', 'icon': 'mdi:map-marker', 'device_class': 'enum'}),
+)
+
+# Components applied to vehicle.climatization
+CLIMATIZATION_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('state'), 'climatization_state', 'Climatization State',
+                        {'p': 'sensor', 'icon': 'mdi:air-conditioner', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('estimated_date_reached'), 'climatization_estimated_date_reached', 'Climatization Estimated Date Reached',
+                        ESTIMATED_DATE_REACHED_TEMPLATE),
+)
+
+# Components applied to vehicle.maintenance
+MAINTENANCE_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('inspection_due_at'), 'inspection_due_at', 'Inspection Due At',
+                        {'p': 'sensor', 'icon': 'mdi:tools', 'device_class': 'timestamp'}),
+    ComponentDescriptor(attrgetter('inspection_due_after'), 'inspection_due_after', 'Inspection Due After',
+                        {'p': 'sensor', 'icon': 'mdi:tools', 'device_class': 'distance', 'state_class': 'measurement'}),
+    ComponentDescriptor(attrgetter('oil_service_due_at'), 'oil_service_due_at', 'Oil Service Due At',
+                        {'p': 'sensor', 'icon': 'mdi:oil', 'device_class': 'timestamp'}),
+    ComponentDescriptor(attrgetter('oil_service_due_after'), 'oil_service_due_after', 'Oil Service Due After',
+                        {'p': 'sensor', 'icon': 'mdi:oil', 'device_class': 'distance', 'state_class': 'measurement'}),
+)
+
+# Components applied to vehicle.charging of electric vehicles
+CHARGING_COMPONENTS: Tuple[ComponentDescriptor, ...] = (
+    ComponentDescriptor(attrgetter('connector.lock_state'), 'charging_connector_lock_state', 'Charging Connector Lock State',
+                        {'p': 'binary_sensor', 'icon': 'mdi:lock', 'device_class': 'lock', 'payload_on': 'unlocked', 'payload_off': 'locked'}),
+    ComponentDescriptor(attrgetter('connector.external_power'), 'charging_connector_external_power', 'Charging Connector External Power',
+                        {'p': 'sensor', 'icon': 'mdi:lightning-bolt', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('state'), 'charging_state', 'Charging State', {'p': 'sensor', 'icon': 'mdi:battery-charging', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('type'), 'charging_type', 'Charging Type', {'p': 'sensor', 'icon': 'mdi:current-ac', 'device_class': 'enum'}),
+    ComponentDescriptor(attrgetter('rate'), 'charging_rate', 'Charging Rate',
+                        {'p': 'sensor', 'icon': 'mdi:speedometer', 'device_class': 'speed', 'state_class': 'measurement'}),
+    ComponentDescriptor(attrgetter('power'), 'charging_power', 'Charging Power',
+                        {'p': 'sensor', 'icon': 'mdi:speedometer', 'device_class': 'power', 'state_class': 'measurement'}),
+    ComponentDescriptor(attrgetter('estimated_date_reached'), 'charging_estimated_date_reached', 'Charging Estimated Date Reached',
+                        ESTIMATED_DATE_REACHED_TEMPLATE),
+)
+
+# Abbreviations defined by the Home Assistant MQTT discovery, see https://www.home-assistant.io/integrations/mqtt/#supported-abbreviations
+HOMEASSISTANT_ABBREVIATIONS: Dict[str, str] = {
+    'action_topic': 'act_t',
+    'availability': 'avty',
+    'command_topic': 'cmd_t',
+    'device_class': 'dev_cla',
+    'icon': 'ic',
+    'json_attributes_topic': 'json_attr_t',
+    'mode_command_topic': 'mode_cmd_t',
+    'mode_state_topic': 'mode_stat_t',
+    'options': 'ops',
+    'payload_lock': 'pl_lock',
+    'payload_off': 'pl_off',
+    'payload_on': 'pl_on',
+    'payload_press': 'pl_prs',
+    'payload_unlock': 'pl_unlk',
+    'power_command_topic': 'pow_cmd_t',
+    'state_class': 'stat_cla',
+    'state_locked': 'stat_locked',
+    'state_off': 'stat_off',
+    'state_on': 'stat_on',
+    'state_topic': 'stat_t',
+    'state_unlocked': 'stat_unlocked',
+    'temperature_command_topic': 'temp_cmd_t',
+    'temperature_state_topic': 'temp_stat_t',
+    'temperature_unit': 'temp_unit',
+    'unique_id': 'uniq_id',
+    'unit_of_measurement': 'unit_of_meas',
+}
+
+
+def _abbreviate(component: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the keys of a discovery component with their Home Assistant abbreviations to reduce the payload size.
+
+    Args:
+        component (Dict[str, Any]): The discovery component.
+
+    Returns:
+        Dict[str, Any]: The discovery component with abbreviated keys.
+    """
+    return {HOMEASSISTANT_ABBREVIATIONS.get(key, key): value for key, value in component.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _is_enum_type(value_type: Optional[type]) -> bool:
+    """
+    Check if the value type of an attribute is an Enum. The result is cached per type.
+
+    Args:
+        value_type (Optional[type]): The value type of the attribute.
+
+    Returns:
+        bool: True if the value type is an Enum, False otherwise.
+    """
+    return value_type is not None and isinstance(value_type, type) and issubclass(value_type, Enum)
+
+
+@functools.lru_cache(maxsize=None)
+def _enum_options(enum_type: Type[Enum]) -> List[Any]:
+    """
+    Get the values of an Enum as options for a Home Assistant enum sensor.
+
+    The list is computed once per Enum and shared between all discovery messages, it must not be modified.
+
+    Args:
+        enum_type (Type[Enum]): The Enum to get the values of.
+
+    Returns:
+        List[Any]: The values of the Enum.
+    """
+    return [item.value for item in enum_type]
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact JSON bytes, using orjson if it is installed.
+
+    Keys are sorted and both serializers produce the same bytes, so the result can be hashed to detect changes.
+
+    Args:
+        obj (Any): The object to serialize.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON representation of the object.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)  # pylint: disable=no-member
+    return json.dumps(obj, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def _mode_to_command_hook(attribute: GenericAttribute, value: Any) -> Any:
+    """
+    Translate the HVAC mode set by Home Assistant into the climatization start/stop command.
+
+    Args:
+        attribute (GenericAttribute): The command attribute the value is set on.
+        value (Any): The mode set by Home Assistant.
+
+    Returns:
+        Any: The command value, values that are not a known mode are passed through.
+    """
+    del attribute
+    # Commands can also be set with structured values, these are not hashable and never a mode
+    if isinstance(value, str):
+        return CLIMATIZATION_MODE_COMMANDS.get(value, value)
+    return value
+
+
+def _has_value(attribute: Optional[GenericAttribute]) -> bool:
+    """
+    Check if an attribute exists, is enabled and has a value.
+
+    Args:
+        attribute (Optional[GenericAttribute]): The attribute to check.
+
+    Returns:
+        bool: True if the attribute is enabled and has a value, False otherwise.
+    """
+    return attribute is not None and attribute.enabled and attribute.value is not None
+
+
+def _owning_vehicle(element: Any) -> Optional[GenericVehicle]:
+    """
+    Find the vehicle an element belongs to by walking up its parents.
+
+    Args:
+        element (Any): The element to start from.
+
+    Returns:
+        Optional[GenericVehicle]: The vehicle or None if the element does not belong to a vehicle.
+    """
+    while element is not None:
+        if isinstance(element, GenericVehicle):
+            return element
+        element = getattr(element, 'parent', None)
+    return None
+
 
 class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
     """
@@ -58,7 +378,22 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
 
         self.mqtt_plugin: Optional[MqttPlugin] = None
         self.homeassistant_discovery: bool = True
-        self.homeassistant_discovery_hashes: Dict[str, int] = {}
+        self.homeassistant_discovery_hashes: Dict[str, bytes] = {}
+        self._topic_prefix: str = ''
+        # Topics of elements, resolving the absolute path walks up all parents and the path of an element does not change
+        self._element_topics: Dict[GenericObject, str] = {}
+        self._availability: List[Dict[str, str]] = []
+        self._announce_images: bool = False
+        self._discovery_prefix: str = ''
+        self._status_topic: str = ''
+        self._discovery_lock: threading.Lock = threading.Lock()
+        self._discovery_timer: Optional[threading.Timer] = None
+        self._pending_discovery_vehicles: Set[GenericVehicle] = set()
+        self._pending_discovery_all: bool = False
+        # Set on every enable or disable event, a full discovery pass that is not forced is skipped if nothing was enabled or disabled since the last one
+        self._discovery_changed: bool = True
+        # Extra topics already registered with the MQTT client, so the state senders only register new ones
+        self._registered_topics: Set[str] = set()
 
         LOG.info("Loading mqtt_homeassistant plugin with config %s", config_remove_credentials(config))
 
@@ -79,6 +414,28 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         if self.mqtt_plugin is None:
             raise ConfigurationError("MQTT plugin is None, MQTT Home Assistant plugin will not work")
 
+        # The topic prefix of the MQTT plugin is fixed by its configuration, it is used for every state topic
+        self._topic_prefix = self.mqtt_plugin.mqtt_client.prefix
+        # All discovery components share the same availability block, it only depends on the MQTT plugin
+        self._availability = [{
+            't': self._topic_prefix + self.mqtt_plugin.connection_state.get_absolute_path(),
+            'pl_not_avail': 'disconnected',
+            'pl_avail': 'connected',
+        }]
+        # Topics below the Home Assistant prefix, the prefix is fixed by the configuration
+        self._discovery_prefix = self.active_config['homeassistant_prefix']
+        self._status_topic = self._discovery_prefix + '/status'
+        # Images can only be announced if pillow is installed and the MQTT plugin publishes them as PNG, both do not change while running
+        self._announce_images = SUPPORT_IMAGES and self.mqtt_plugin.mqtt_client.image_format == ImageFormat.PNG
+
+        # Restore discovery hashes from the last run so that unchanged discovery messages are not published again
+        cached_hashes: Dict[str, str] = self.car_connectivity.get_cache().get(self._discovery_hashes_cache_key, {})
+        for discovery_id, discovery_hash in cached_hashes.items():
+            try:
+                self.homeassistant_discovery_hashes[discovery_id] = bytes.fromhex(discovery_hash)
+            except (TypeError, ValueError):
+                LOG.debug("Ignoring invalid cached discovery hash for %s", discovery_id)
+
         self.mqtt_plugin.mqtt_client.add_on_message_callback(self._on_message_callback)
         self.mqtt_plugin.mqtt_client.add_on_connect_callback(self._on_connect_callback)
 
@@ -93,8 +450,16 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
             self.mqtt_plugin.mqtt_client.remove_on_message_callback(self._on_message_callback)
             self.mqtt_plugin.mqtt_client.remove_on_connect_callback(self._on_connect_callback)
         self.car_connectivity.remove_observer(self._on_carconnectivity_event)
+        self._cancel_pending_discovery()
+        # Persist discovery hashes so that a restart does not republish unchanged discovery messages
+        self.car_connectivity.get_cache()[self._discovery_hashes_cache_key] = \
+            {discovery_id: discovery_hash.hex() for discovery_id, discovery_hash in self.homeassistant_discovery_hashes.items()}
         return super().shutdown()
 
+    @property
+    def _discovery_hashes_cache_key(self) -> str:
+        return f'plugins/{self.id}/homeassistant_discovery_hashes'
+
     def get_version(self) -> str:
         return __version__
 
@@ -109,117 +474,164 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
     def get_name(self) -> str:
         return "MQTT Home Assistant Plugin"
 
-    def _publish_homeassistant_discovery(self, force=False) -> None:  # pylint: disable=too-many-branches
+    def _unit_of_measurement(self, attribute: GenericAttribute) -> Optional[str]:
+        """
+        Get the unit of measurement of an attribute in the locale configured for the MQTT client.
+
+        Args:
+            attribute (GenericAttribute): The attribute to get the unit for.
+
+        Returns:
+            Optional[str]: The unit of measurement or None if the attribute has no unit.
+        """
+        if self.mqtt_plugin is None:
+            raise ValueError('MQTT plugin is None')
+        if attribute.unit is not None:
+            _, unit = attribute.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
+            if unit is not None:
+                return unit.value
+        return None
+
+    def _element_topic(self, element: GenericObject) -> str:
+        """
+        Get the MQTT topic of an element, the topic is cached until the element is disabled.
+
+        Args:
+            element (GenericObject): The element to get the topic for.
+
+        Returns:
+            str: The MQTT topic of the element.
+        """
+        topic: Optional[str] = self._element_topics.get(element)
+        if topic is None:
+            topic = self._topic_prefix + element.get_absolute_path()
+            self._element_topics[element] = topic
+        return topic
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    def _discovery_component(self, template: Dict[str, Any], name: str, unique_id: str, attribute: Optional[GenericAttribute] = None,
+                             **extra: Any) -> Dict[str, Any]:
+        """
+        Build a component for the Home Assistant discovery message.
+
+        Args:
+            template (Dict[str, Any]): The static keys of the component, e.g. platform, icon and device class. It is copied and not modified.
+            name (str): The name of the component.
+            unique_id (str): The unique id of the component.
+            attribute (Optional[GenericAttribute]): The attribute providing the state and unit of the component.
+            **extra (Any): Further keys of the component, these take precedence over the template.
+
+        Returns:
+            Dict[str, Any]: The discovery component.
+        """
+        if self.mqtt_plugin is None:
+            raise ValueError('MQTT plugin is None')
+        component: Dict[str, Any] = template.copy()
+        component['name'] = name
+        if attribute is not None:
+            component['state_topic'] = self._element_topic(attribute)
+            unit: Optional[str] = self._unit_of_measurement(attribute)
+            if unit is not None:
+                component['unit_of_measurement'] = unit
+        component.update(extra)
+        component['unique_id'] = unique_id
+        component['availability'] = self._availability
+        return component
+
+    # pylint: disable-next=too-many-arguments, too-many-positional-arguments
+    def _add_descriptor_components(self, cmps: Dict[str, Dict[str, Any]], uid_prefix: str, element: Any,
+                                   descriptors: Tuple[ComponentDescriptor, ...], name_suffix: str = '') -> None:
+        """
+        Add the components of a descriptor table for all attributes of the element that have a value.
+
+        Args:
+            cmps (Dict[str, Dict[str, Any]]): The components of the discovery message, added components are inserted here.
+            uid_prefix (str): The prefix of the unique ids of the components.
+            element (Any): The element the getters of the descriptors are applied to.
+            descriptors (Tuple[ComponentDescriptor, ...]): The descriptor table.
+            name_suffix (str): Appended to the names of the components, e.g. to distinguish drives.
+        """
+        for descriptor in descriptors:
+            attribute: Optional[GenericAttribute] = descriptor.getter(element)
+            if _has_value(attribute):
+                uid: str = uid_prefix + descriptor.suffix
+                component: Dict[str, Any] = self._discovery_component(descriptor.template, descriptor.name + name_suffix, uid, attribute=attribute)
+                if descriptor.template.get('device_class') == 'enum' and _is_enum_type(attribute.value_type):
+                    component['options'] = _enum_options(attribute.value_type)
+                cmps[uid] = component
+
+    def _publish_homeassistant_discovery(self, force=False) -> None:  # pylint: disable=too-many-branches, too-many-locals
+        if self.mqtt_plugin is None:
+            raise ValueError('MQTT plugin is None')
+        # When the MQTT client is not connected, we can't publish the discovery messages
+        if not self.mqtt_plugin.mqtt_client.is_connected():
+            return
+        if not force and not self._discovery_changed:
+            LOG.debug("Nothing was enabled or disabled since the last discovery, skipping Home Assistant discovery")
+            return
+        # Cleared before building, so events arriving while building mark the next pass as needed again
+        self._discovery_changed = False
         for vehicle in self.car_connectivity.garage.list_vehicles():
             if vehicle.enabled:
                 self._publish_homeassistant_discovery_vehicle(vehicle, force=force)
-        if self.mqtt_plugin is None:
-            raise ValueError('MQTT plugin is None')
-        car_connectivity_id: str = self.mqtt_plugin.mqtt_client.prefix.replace('/', '-')
-        discovery_topic = f'{self.active_config["homeassistant_prefix"]}/device/carconnectivity-{car_connectivity_id}/config'
-        discovery_message = {
+        prefix: str = self._topic_prefix
+        car_connectivity_id: str = prefix.replace('/', '-')
+        ccid_: str = car_connectivity_id + '_'
+        uid: str
+        discovery_topic = f'{self._discovery_prefix}/device/carconnectivity-{car_connectivity_id}/config'
+        discovery_message: Dict[str, Any] = {
             'device': {
                 'ids': car_connectivity_id,
                 'name': 'CarConnectivity',
                 'mf': 'Till Steinbach and the CarConnectivity Community',
                 'sw': __carconnectivity_version__,
             },
-            'origin': {
-                'name': 'CarConnectivity',
-                'sw': __version__,
-                'url': 'https://github.com/tillsteinbach/CarConnectivity'
-            },
-            'cmps': {}
+            'origin': BRIDGE_ORIGIN,
         }
+        # Components are collected separately and only added to the message when it is serialized
+        cmps: Dict[str, Dict[str, Any]] = {}
         if self.car_connectivity.commands.enabled and 'update' in self.car_connectivity.commands.commands:
-            discovery_message['cmps'][f'{car_connectivity_id}_update'] = {
-                'p': 'button',
-                'name': 'Force Update',
-                'icon': 'mdi:refresh',
-                'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{self.car_connectivity.commands.commands["update"].get_absolute_path()}'
-                + '_writetopic',
-                'payload_press': 'update',
-                'unique_id': f'{car_connectivity_id}_update'
-            }
+            uid = ccid_ + 'update'
+            cmps[uid] = self._discovery_component(
+                UPDATE_BUTTON_TEMPLATE, 'Force Update', uid,
+                command_topic=self._element_topic(self.car_connectivity.commands.commands['update']) + '_writetopic')
         for connector in self.car_connectivity.connectors.connectors.values():
             if connector.enabled:
-                if connector.healthy.enabled and connector.healthy.value is not None:
-                    discovery_message['cmps'][f'{car_connectivity_id}_{connector.id}_healthy'] = {
-                        'p': 'binary_sensor',
-                        'device_class': 'running',
-                        'name': f'{connector.get_name()} Healthy',
-                        'icon': 'mdi:check',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{connector.healthy.get_absolute_path()}',
-                        'payload_off': 'False',
-                        'payload_on': 'True',
-                        'unique_id': f'{car_connectivity_id}_{connector.id}_healthy'
-                    }
+                connector_: str = ccid_ + connector.id + '_'
+                if _has_value(connector.healthy):
+                    uid = connector_ + 'healthy'
+                    cmps[uid] = self._discovery_component(HEALTHY_TEMPLATE, f'{connector.get_name()} Healthy', uid, attribute=connector.healthy)
                 if connector.commands.enabled and 'update' in connector.commands.commands:
-                    discovery_message['cmps'][f'{car_connectivity_id}_{connector.id}_update'] = {
-                        'p': 'button',
-                        'name': f'Force {connector.get_name()} Update',
-                        'icon': 'mdi:refresh',
-                        'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{connector.commands.commands["update"].get_absolute_path()}'
-                        + '_writetopic',
-                        'payload_press': 'update',
-                        'unique_id': f'{car_connectivity_id}_{connector.id}_update'
-                    }
+                    uid = connector_ + 'update'
+                    cmps[uid] = self._discovery_component(
+                        UPDATE_BUTTON_TEMPLATE, f'Force {connector.get_name()} Update', uid,
+                        command_topic=self._element_topic(connector.commands.commands['update']) + '_writetopic')
                 for child in connector.children:
                     if child.id == 'connection_state' and isinstance(child, EnumAttribute) and child.enabled:
-                        discovery_message['cmps'][f'{car_connectivity_id}_{connector.id}_connection_state'] = {
-                            'p': 'sensor',
-                            'device_class': 'enum',
-                            'name': f'{connector.get_name()} Connection State',
-                            'icon': 'mdi:lan-connect',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{child.get_absolute_path()}',
-                            'payload_off': 'False',
-                            'payload_on': 'True',
-                            'unique_id': f'{car_connectivity_id}_{connector.id}_connection_state'
-                        }
-                        if child.value_type is not None and issubclass(child.value_type, Enum):
-                            discovery_message['cmps'][f'{car_connectivity_id}_{connector.id}_connection_state']['options'] = \
-                                [item.value for item in child.value_type]
+                        uid = connector_ + 'connection_state'
+                        cmps[uid] = self._discovery_component(CONNECTION_STATE_TEMPLATE, f'{connector.get_name()} Connection State', uid, attribute=child)
+                        if _is_enum_type(child.value_type):
+                            cmps[uid]['options'] = _enum_options(child.value_type)
 
         for plugin in self.car_connectivity.plugins.plugins.values():
             if plugin.enabled:
-                if plugin.healthy.enabled and plugin.healthy.value is not None:
-                    discovery_message['cmps'][f'{car_connectivity_id}_{plugin.id}_healthy'] = {
-                        'p': 'binary_sensor',
-                        'device_class': 'running',
-                        'name': f'{plugin.get_name()} Healthy',
-                        'icon': 'mdi:check',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{plugin.healthy.get_absolute_path()}',
-                        'payload_off': 'False',
-                        'payload_on': 'True',
-                        'unique_id': f'{car_connectivity_id}_{plugin.id}_healthy'
-                    }
+                plugin_: str = ccid_ + plugin.id + '_'
+                if _has_value(plugin.healthy):
+                    uid = plugin_ + 'healthy'
+                    cmps[uid] = self._discovery_component(HEALTHY_TEMPLATE, f'{plugin.get_name()} Healthy', uid, attribute=plugin.healthy)
                 for child in plugin.children:
                     if child.id == 'connection_state' and isinstance(child, EnumAttribute) and child.enabled:
-                        discovery_message['cmps'][f'{car_connectivity_id}_{plugin.id}_connection_state'] = {
-                            'p': 'sensor',
-                            'device_class': 'enum',
-                            'name': f'{plugin.get_name()} Connected',
-                            'icon': 'mdi:lan-connect',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{child.get_absolute_path()}',
-                            'payload_off': 'False',
-                            'payload_on': 'True',
-                            'unique_id': f'{car_connectivity_id}_{plugin.id}_connection_state'
-                        }
-                        if child.value_type is not None and issubclass(child.value_type, Enum):
-                            discovery_message['cmps'][f'{car_connectivity_id}_{plugin.id}_connection_state']['options'] = \
-                                [item.value for item in child.value_type]
-        for sensor in discovery_message['cmps'].values():
-            sensor['availability'] = [{
-                'topic': f'{self.mqtt_plugin.mqtt_client.prefix}{self.mqtt_plugin.connection_state.get_absolute_path()}',
-                'payload_not_available': 'disconnected',
-                'payload_available': 'connected',
-                }]
-        discovery_hash = hash(json.dumps(discovery_message))
-        if car_connectivity_id not in self.homeassistant_discovery_hashes \
-                or self.homeassistant_discovery_hashes[car_connectivity_id] != discovery_hash or force:
+                        uid = plugin_ + 'connection_state'
+                        cmps[uid] = self._discovery_component(CONNECTION_STATE_TEMPLATE, f'{plugin.get_name()} Connected', uid, attribute=child)
+                        if _is_enum_type(child.value_type):
+                            cmps[uid]['options'] = _enum_options(child.value_type)
+        discovery_message['cmps'] = {component_id: _abbreviate(component) for component_id, component in cmps.items()}
+        payload: bytes = _json_dumps(discovery_message)
+        discovery_hash: bytes = hashlib.blake2b(payload, digest_size=16).digest()
+        if force or self.homeassistant_discovery_hashes.get(car_connectivity_id) != discovery_hash:
             self.homeassistant_discovery_hashes[car_connectivity_id] = discovery_hash
             LOG.debug("Publishing Home Assistant discovery message for CarConnectivity with Connectors and Plugins")
-            self.mqtt_plugin.mqtt_client.publish(topic=discovery_topic, qos=1, retain=False, payload=json.dumps(discovery_message, indent=4))
+            self.mqtt_plugin.mqtt_client.publish(topic=discovery_topic, qos=1, retain=True, payload=payload)
 
     # pylint: disable-next=too-many-branches, too-many-statements, too-many-locals
     def _publish_homeassistant_discovery_vehicle(self, vehicle: GenericVehicle, force=False) -> None:
@@ -231,917 +643,384 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         """
         if self.mqtt_plugin is None:
             raise ValueError('MQTT plugin is None')
-        if vehicle.vin is None or vehicle.vin.value is None:
-            raise ValueError('Vehicle VIN is None')
         # When the MQTT client is not connected, we can't publish the discovery message
         if not self.mqtt_plugin.mqtt_client.is_connected():
             return
+        # Without a VIN there is no device to publish, skip the vehicle without affecting the others
+        if vehicle.vin is None or vehicle.vin.value is None:
+            LOG.debug("Skipping Home Assistant discovery message for vehicle without VIN")
+            return
         vin: str = vehicle.vin.value
-        car_connectivity_id: str = self.mqtt_plugin.mqtt_client.prefix.replace('/', '-')
-        discovery_topic = f'{self.active_config["homeassistant_prefix"]}/device/{vin}/config'
-        discovery_message = {
+        vin_: str = vin + '_'
+        uid: str
+        prefix: str = self._topic_prefix
+        car_connectivity_id: str = prefix.replace('/', '-')
+
+        topic = self._element_topic
+
+        def write_topic(element: GenericObject) -> str:
+            return topic(element) + '_writetopic'
+
+        discovery_topic = f'{self._discovery_prefix}/device/{vin}/config'
+        discovery_message: Dict[str, Any] = {
             'device': {
                 'ids': vin,
                 'sn': vin,
                 'via_device': car_connectivity_id,
             },
-            'origin': {
-                'name': 'carconnectivity-plugin-mqtt',
-                'sw': __version__,
-                'url': 'https://github.com/tillsteinbach/CarConnectivity-plugin-mqtt'
-            },
-            'cmps': {}
+            'origin': VEHICLE_ORIGIN,
         }
-        if vehicle.name.enabled and vehicle.name.value is not None:
+        # Components are collected separately and only added to the message when it is serialized
+        cmps: Dict[str, Dict[str, Any]] = {}
+        if _has_value(vehicle.name):
             discovery_message['device']['name'] = vehicle.name.value
-        if vehicle.manufacturer.enabled and vehicle.manufacturer.value is not None:
+        if _has_value(vehicle.manufacturer):
             discovery_message['device']['mf'] = vehicle.manufacturer.value
-        if vehicle.model.enabled and vehicle.model.value is not None:
+        if _has_value(vehicle.model):
             discovery_message['device']['mdl'] = vehicle.model.value
-        if vehicle.model_year.enabled and vehicle.model_year.value is not None:
+        if _has_value(vehicle.model_year):
             discovery_message['device']['hw'] = str(vehicle.model_year.value)
-        if vehicle.software is not None and vehicle.software.enabled and vehicle.software.version.enabled and vehicle.software.version.value is not None:
+        if vehicle.software is not None and vehicle.software.enabled and _has_value(vehicle.software.version):
             discovery_message['device']['sw'] = vehicle.software.version.value
 
         if vehicle.commands.enabled and 'wake-sleep' in vehicle.commands.commands:
-            discovery_message['cmps'][f'{vin}_wake'] = {
-                'p': 'button',
-                'name': 'Wakeup',
-                'icon': 'mdi:sleep-off',
-                'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.commands.commands["wake-sleep"].get_absolute_path()}'
-                + '_writetopic',
-                'payload_press': 'wake',
-                'unique_id': f'{vin}_wake'
-            }
-        if vehicle.odometer.enabled and vehicle.odometer.value is not None:
-            discovery_message['cmps'][f'{vin}_odometer'] = {
-                'p': 'sensor',
-                'device_class': 'distance',
-                'state_class': 'total',
-                'icon': 'mdi:counter',
-                'name': 'Odometer',
-                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.odometer.get_absolute_path()}',
-                'unique_id': f'{vin}_odometer',
-            }
-            if vehicle.odometer.unit is not None:
-                _, unit = vehicle.odometer.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                if unit is not None:
-                    discovery_message['cmps'][f'{vin}_odometer']['unit_of_measurement'] = unit.value
-        if vehicle.state.enabled and vehicle.state.value is not None:
-            discovery_message['cmps'][f'{vin}_state'] = {
-                'p': 'sensor',
-                'device_class': 'enum',
-                'icon': 'mdi:car-hatchback',
-                'name': 'Vehicle State',
-                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.state.get_absolute_path()}',
-                'unique_id': f'{vin}_state'
-            }
-            if vehicle.state.value_type is not None and issubclass(vehicle.state.value_type, Enum):
-                discovery_message['cmps'][f'{vin}_state']['options'] = [item.value for item in vehicle.state.value_type]
-        if vehicle.connection_state.enabled and vehicle.connection_state.value is not None:
-            discovery_message['cmps'][f'{vin}_connection_state'] = {
-                'p': 'sensor',
-                'device_class': 'enum',
-                'icon': 'mdi:car-connected',
-                'name': 'Connection State',
-                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.connection_state.get_absolute_path()}',
-                'unique_id': f'{vin}_connection_state'
-            }
-            if vehicle.connection_state.value_type is not None and issubclass(vehicle.connection_state.value_type, Enum):
-                discovery_message['cmps'][f'{vin}_connection_state']['options'] = [item.value for item in vehicle.connection_state.value_type]
+            uid = vin_ + 'wake'
+            cmps[uid] = self._discovery_component(WAKEUP_BUTTON_TEMPLATE, 'Wakeup', uid, command_topic=write_topic(vehicle.commands.commands['wake-sleep']))
+        self._add_descriptor_components(cmps, vin_, vehicle, VEHICLE_COMPONENTS)
         if vehicle.drives is not None and vehicle.drives.enabled:  # pylint: disable=too-many-nested-blocks
-            if vehicle.drives.total_range.enabled and vehicle.drives.total_range.value is not None:
-                discovery_message['cmps'][f'{vin}_total_range'] = {
-                    'p': 'sensor',
-                    'device_class': 'distance',
-                    'state_class': 'measurement',
-                    'name': 'Total Range',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.drives.total_range.get_absolute_path()}',
-                    'unique_id': f'{vin}_total_range'
-                }
-                if vehicle.drives.total_range.unit is not None:
-                    _, unit = vehicle.drives.total_range.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_total_range']['unit_of_measurement'] = unit.value
+            if _has_value(vehicle.drives.total_range):
+                uid = vin_ + 'total_range'
+                cmps[uid] = self._discovery_component(RANGE_TEMPLATE, 'Total Range', uid, attribute=vehicle.drives.total_range)
             for drive_id, drive in vehicle.drives.drives.items():
                 if drive.enabled:
-                    if drive.range.enabled and drive.range.value is not None:
-                        discovery_message['cmps'][f'{vin}_{drive_id}_range'] = {
-                            'p': 'sensor',
-                            'device_class': 'distance',
-                            'state_class': 'measurement',
-                            'name': f'Range ({drive_id})',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.range.get_absolute_path()}',
-                            'unique_id': f'{vin}_{drive_id}_range'
-                        }
-                        if drive.range.unit is not None:
-                            _, unit = drive.range.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                            if unit is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_range']['unit_of_measurement'] = unit.value
-                    if drive.range_estimated_full.enabled and drive.range_estimated_full.value is not None:
-                        discovery_message['cmps'][f'{vin}_{drive_id}_range_estimated_full'] = {
-                            'p': 'sensor',
-                            'device_class': 'distance',
-                            'state_class': 'measurement',
-                            'name': f'Range at 100% ({drive_id})',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.range_estimated_full.get_absolute_path()}',
-                            'unique_id': f'{vin}_{drive_id}_range_estimated_full'
-                        }
-                        if drive.range_estimated_full.unit is not None:
-                            _, unit = drive.range_estimated_full.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                            if unit is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_range_estimated_full']['unit_of_measurement'] = unit.value
-                    if drive.range_wltp.enabled and drive.range_wltp.value is not None:
-                        discovery_message['cmps'][f'{vin}_{drive_id}_range_wltp'] = {
-                            'p': 'sensor',
-                            'device_class': 'distance',
-                            'state_class': 'measurement',
-                            'name': f'Range WLTP ({drive_id})',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.range_wltp.get_absolute_path()}',
-                            'unique_id': f'{vin}_{drive_id}_range_wltp'
-                        }
-                        if drive.range_wltp.unit is not None:
-                            _, unit = drive.range_wltp.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                            if unit is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_range_wltp']['unit_of_measurement'] = unit.value
+                    drive_: str = vin_ + drive_id + '_'
+                    drive_name: str = f' ({drive_id})'
+                    self._add_descriptor_components(cmps, drive_, drive, DRIVE_COMPONENTS, name_suffix=drive_name)
                     if isinstance(drive, CombustionDrive):
-                        if drive.level.enabled and drive.level.value is not None:
-                            discovery_message['cmps'][f'{vin}_{drive_id}_level'] = {
-                                'p': 'sensor',
-                                'state_class': 'measurement',
-                                'name': f'Tank ({drive_id})',
-                                'icon': 'mdi:gas-station',
-                                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.level.get_absolute_path()}',
-                                'unique_id': f'{vin}_{drive_id}_level'
-                            }
-                            if drive.level.unit is not None:
-                                _, unit = drive.level.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                if unit is not None:
-                                    discovery_message['cmps'][f'{vin}_{drive_id}_level']['unit_of_measurement'] = unit.value
-                        if drive.consumption.enabled and drive.consumption.value is not None:
-                            discovery_message['cmps'][f'{vin}_{drive_id}_consumption'] = {
-                                'p': 'sensor',
-                                'state_class': 'measurement',
-                                'name': f'Consumption ({drive_id})',
-                                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.consumption.get_absolute_path()}',
-                                'unique_id': f'{vin}_{drive_id}_consumption'
-                            }
-                            if drive.consumption.unit is not None:
-                                _, unit = drive.consumption.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                if unit is not None:
-                                    discovery_message['cmps'][f'{vin}_{drive_id}_consumption']['unit_of_measurement'] = unit.value
+                        self._add_descriptor_components(cmps, drive_, drive, COMBUSTION_DRIVE_COMPONENTS, name_suffix=drive_name)
                         if drive.fuel_tank is not None and drive.fuel_tank.enabled:
-                            if drive.fuel_tank.available_capacity.enabled and drive.fuel_tank.available_capacity.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_available_capacity'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'volume',
-                                    'state_class': 'measurement',
-                                    'name': f'Available Capacity ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.fuel_tank.available_capacity.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_available_capacity'
-                                }
-                                if drive.fuel_tank.available_capacity.unit is not None:
-                                    _, unit = drive.fuel_tank.available_capacity.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_available_capacity']['unit_of_measurement'] = unit.value
+                            self._add_descriptor_components(cmps, drive_, drive.fuel_tank, FUEL_TANK_COMPONENTS, name_suffix=drive_name)
                         if isinstance(drive, DieselDrive):
-                            if drive.adblue_level.enabled and drive.adblue_level.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_adbluelevel'] = {
-                                    'p': 'sensor',
-                                    'state_class': 'measurement',
-                                    'name': f'AdBlue Tank ({drive_id})',
-                                    'icon': 'mdi:gas-station',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.adblue_level.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_adbluelevel'
-                                }
-                                if drive.adblue_level.unit is not None:
-                                    _, unit = drive.adblue_level.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_adbluelevel']['unit_of_measurement'] = unit.value
-                            if drive.adblue_range.enabled and drive.adblue_range.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_adbluerange'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'distance',
-                                    'state_class': 'measurement',
-                                    'name': f'AdBlue Range ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.adblue_range.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_adbluerange'
-                                }
-                                if drive.adblue_range.unit is not None:
-                                    _, unit = drive.adblue_range.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_adbluerange']['unit_of_measurement'] = unit.value
-                            if drive.adblue_range_estimated_full.enabled and drive.adblue_range_estimated_full.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_adblue_range_estimated_full'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'distance',
-                                    'state_class': 'measurement',
-                                    'name': f'AdBlue Range at 100% ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.adblue_range_estimated_full.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_adblue_range_estimated_full'
-                                }
-                                if drive.adblue_range_estimated_full.unit is not None:
-                                    _, unit = drive.adblue_range_estimated_full.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_adblue_range_estimated_full']['unit_of_measurement'] = unit.value
-                            if drive.adblue_consumption.enabled and drive.adblue_consumption.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_adblue_consumption'] = {
-                                    'p': 'sensor',
-                                    'state_class': 'measurement',
-                                    'name': f'AdBlue Consumption ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.adblue_consumption.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_adblue_consumption'
-                                }
-                                if drive.adblue_consumption.unit is not None:
-                                    _, unit = drive.adblue_consumption.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_adblue_consumption']['unit_of_measurement'] = unit.value
+                            self._add_descriptor_components(cmps, drive_, drive, DIESEL_DRIVE_COMPONENTS, name_suffix=drive_name)
                             if drive.adblue_tank is not None and drive.adblue_tank.enabled:
-                                if drive.adblue_tank.available_capacity.enabled and drive.adblue_tank.available_capacity.value is not None:
-                                    discovery_message['cmps'][f'{vin}_{drive_id}_adblue_available_capacity'] = {
-                                        'p': 'sensor',
-                                        'device_class': 'volume',
-                                        'state_class': 'measurement',
-                                        'name': f'AdBlue Available Capacity ({drive_id})',
-                                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.adblue_tank.available_capacity.get_absolute_path()}',
-                                        'unique_id': f'{vin}_{drive_id}_adblue_available_capacity'
-                                    }
-                                    if drive.adblue_tank.available_capacity.unit is not None:
-                                        _, unit = drive.adblue_tank.available_capacity.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                        if unit is not None:
-                                            discovery_message['cmps'][f'{vin}_{drive_id}_adblue_available_capacity']['unit_of_measurement'] = unit.value
+                                self._add_descriptor_components(cmps, drive_, drive.adblue_tank, ADBLUE_TANK_COMPONENTS, name_suffix=drive_name)
                     elif isinstance(drive, ElectricDrive):
-                        if drive.level.enabled and drive.level.value is not None:
-                            discovery_message['cmps'][f'{vin}_{drive_id}_level'] = {
-                                'p': 'sensor',
-                                'device_class': 'battery',
-                                'state_class': 'measurement',
-                                'name': f'SoC ({drive_id})',
-                                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.level.get_absolute_path()}',
-                                'unique_id': f'{vin}_{drive_id}_level'
-                            }
-                            if drive.level.unit is not None:
-                                _, unit = drive.level.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                if unit is not None:
-                                    discovery_message['cmps'][f'{vin}_{drive_id}_level']['unit_of_measurement'] = unit.value
-                        if drive.consumption.enabled and drive.consumption.value is not None:
-                            discovery_message['cmps'][f'{vin}_{drive_id}_consumption'] = {
-                                'p': 'sensor',
-                                'device_class': 'energy_distance',
-                                'state_class': 'measurement',
-                                'name': f'Consumption ({drive_id})',
-                                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.consumption.get_absolute_path()}',
-                                'unique_id': f'{vin}_{drive_id}_consumption'
-                            }
-                            if drive.consumption.unit is not None:
-                                _, unit = drive.consumption.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                if unit is not None:
-                                    discovery_message['cmps'][f'{vin}_{drive_id}_consumption']['unit_of_measurement'] = unit.value
+                        self._add_descriptor_components(cmps, drive_, drive, ELECTRIC_DRIVE_COMPONENTS, name_suffix=drive_name)
                         if drive.battery is not None and drive.battery.enabled:
-                            if drive.battery.temperature.enabled and drive.battery.temperature.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_battery_temperature'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'temperature',
-                                    'state_class': 'measurement',
-                                    'icon': 'mdi:thermometer-lines',
-                                    'name': f'Battery Temperature ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.battery.temperature.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_battery_temperature'
-                                }
-                                if drive.battery.temperature.unit is not None:
-                                    _, unit = drive.battery.temperature.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_battery_temperature']['unit_of_measurement'] = unit.value
-                            if drive.battery.total_capacity.enabled and drive.battery.total_capacity.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_battery_total_capacity'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'energy',
-                                    'state_class': 'measurement',
-                                    'name': f'Battery Total Capacity ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.battery.total_capacity.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_battery_total_capacity'
-                                }
-                                if drive.battery.total_capacity.unit is not None:
-                                    _, unit = drive.battery.total_capacity.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_battery_total_capacity']['unit_of_measurement'] = unit.value
-                            if drive.battery.available_capacity.enabled and drive.battery.available_capacity.value is not None:
-                                discovery_message['cmps'][f'{vin}_{drive_id}_battery_available_capacity'] = {
-                                    'p': 'sensor',
-                                    'device_class': 'energy',
-                                    'state_class': 'measurement',
-                                    'name': f'Battery Available Capacity ({drive_id})',
-                                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{drive.battery.available_capacity.get_absolute_path()}',
-                                    'unique_id': f'{vin}_{drive_id}_battery_available_capacity'
-                                }
-                                if drive.battery.available_capacity.unit is not None:
-                                    _, unit = drive.battery.available_capacity.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                                    if unit is not None:
-                                        discovery_message['cmps'][f'{vin}_{drive_id}_battery_available_capacity']['unit_of_measurement'] = unit.value
-        if vehicle.doors is not None and vehicle.doors.enabled:
-            if vehicle.doors.open_state.enabled and vehicle.doors.open_state.value is not None:
-                discovery_message['cmps'][f'{vin}_open_state'] = {
-                    'p': 'binary_sensor',
-                    'device_class': 'door',
-                    'name': 'Door Open State',
-                    'icon': 'mdi:car-door',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.doors.open_state.get_absolute_path()}',
-                    'payload_off': 'closed',
-                    'payload_on': 'open',
-                    'unique_id': f'{vin}_open_state'
-                }
-            if vehicle.doors.lock_state.enabled and vehicle.doors.lock_state.value is not None:
-                if 'lock-unlock' in vehicle.doors.commands.commands:
-                    discovery_message['cmps'][f'{vin}_lock_unlock'] = {
-                        'p': 'lock',
-                        'name': 'Lock/Unlock',
-                        'icon': 'mdi:car-door-lock',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.doors.lock_state.get_absolute_path()}',
-                        'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.doors.commands.commands["lock-unlock"].get_absolute_path()}'
-                        + '_writetopic',
-                        'payload_lock': 'lock',
-                        'payload_unlock': 'unlock',
-                        'state_locked': 'locked',
-                        'state_unlocked': 'unlocked',
-                        'unique_id': f'{vin}_lock_unlock'
-                    }
+                            self._add_descriptor_components(cmps, drive_, drive.battery, BATTERY_COMPONENTS, name_suffix=drive_name)
+        doors = vehicle.doors
+        if doors is not None and doors.enabled:
+            if _has_value(doors.open_state):
+                uid = vin_ + 'open_state'
+                cmps[uid] = self._discovery_component(DOOR_OPEN_TEMPLATE, 'Door Open State', uid, attribute=doors.open_state)
+            if _has_value(doors.lock_state):
+                if 'lock-unlock' in doors.commands.commands:
+                    uid = vin_ + 'lock_unlock'
+                    cmps[uid] = self._discovery_component(
+                        LOCK_TEMPLATE, 'Lock/Unlock', uid, attribute=doors.lock_state,
+                        command_topic=write_topic(doors.commands.commands['lock-unlock']))
                 else:
-                    discovery_message['cmps'][f'{vin}_lock_state'] = {
-                        'p': 'binary_sensor',
-                        'device_class': 'lock',
-                        'name': 'Lock State',
-                        'icon': 'mdi:car-door-lock',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.doors.lock_state.get_absolute_path()}',
-                        'payload_on': 'unlocked',
-                        'payload_off': 'locked',
-                        'unique_id': f'{vin}_lock_state'
-                    }
-            for door_id, door in vehicle.doors.doors.items():
+                    uid = vin_ + 'lock_state'
+                    cmps[uid] = self._discovery_component(DOOR_LOCK_TEMPLATE, 'Lock State', uid, attribute=doors.lock_state)
+            for door_id, door in doors.doors.items():
                 if door.enabled:
-                    if door.open_state.enabled and door.open_state.value is not None \
-                            and door.open_state.value not in [Doors.OpenState.UNKNOWN, Doors.OpenState.INVALID, Doors.OpenState.UNSUPPORTED]:
-                        discovery_message['cmps'][f'{vin}_{door_id}_door_open_state'] = {
-                            'p': 'binary_sensor',
-                            'device_class': 'door',
-                            'name': f'Door Open State ({door_id})',
-                            'icon': 'mdi:car-door',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{door.open_state.get_absolute_path()}',
-                            'payload_off': 'closed',
-                            'payload_on': 'open',
-                            'unique_id': f'{vin}_{door_id}_door_open_state'
-                        }
-                    if door.lock_state.enabled and door.lock_state.value is not None \
-                            and door.lock_state.value not in [Doors.LockState.UNKNOWN, Doors.LockState.INVALID]:
-                        discovery_message['cmps'][f'{vin}_{door_id}_door_lock_state'] = {
-                            'p': 'binary_sensor',
-                            'device_class': 'lock',
-                            'name': f'Lock State ({door_id})',
-                            'icon': 'mdi:car-door-lock',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{door.lock_state.get_absolute_path()}',
-                            'payload_on': 'unlocked',
-                            'payload_off': 'locked',
-                            'unique_id': f'{vin}_{door_id}_door_lock_state'
-                        }
-        if vehicle.windows is not None and vehicle.windows.enabled:
-            if vehicle.windows.open_state.enabled and vehicle.windows.open_state.value is not None:
-                discovery_message['cmps'][f'{vin}_window_open_state'] = {
-                    'p': 'binary_sensor',
-                    'device_class': 'window',
-                    'name': 'Window Open State',
-                    'icon': 'mdi:window-open',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.windows.open_state.get_absolute_path()}',
-                    'payload_off': 'closed',
-                    'payload_on': 'open',
-                    'unique_id': f'{vin}_window_open_state'
-                }
-            for window_id, window in vehicle.windows.windows.items():
+                    if _has_value(door.open_state) and door.open_state.value not in DOOR_OPEN_STATES_WITHOUT_SENSOR:
+                        uid = vin_ + door_id + '_door_open_state'
+                        cmps[uid] = self._discovery_component(DOOR_OPEN_TEMPLATE, f'Door Open State ({door_id})', uid, attribute=door.open_state)
+                    if _has_value(door.lock_state) and door.lock_state.value not in DOOR_LOCK_STATES_WITHOUT_SENSOR:
+                        uid = vin_ + door_id + '_door_lock_state'
+                        cmps[uid] = self._discovery_component(DOOR_LOCK_TEMPLATE, f'Lock State ({door_id})', uid, attribute=door.lock_state)
+        windows = vehicle.windows
+        if windows is not None and windows.enabled:
+            if _has_value(windows.open_state):
+                uid = vin_ + 'window_open_state'
+                cmps[uid] = self._discovery_component(WINDOW_OPEN_TEMPLATE, 'Window Open State', uid, attribute=windows.open_state)
+            for window_id, window in windows.windows.items():
                 if window.enabled:
-                    if window.open_state.enabled and window.open_state.value is not None:
-                        discovery_message['cmps'][f'{vin}_{window_id}_window_open_state'] = {
-                            'p': 'binary_sensor',
-                            'device_class': 'window',
-                            'name': f'Window Open State ({window_id})',
-                            'icon': 'mdi:window-open',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{window.open_state.get_absolute_path()}',
-                            'payload_off': 'closed',
-                            'payload_on': 'open',
-                            'unique_id': f'{vin}_{window_id}_window_open_state'
-                        }
-        if vehicle.lights is not None and vehicle.lights.enabled:
-            if vehicle.lights.light_state.enabled and vehicle.lights.light_state.value is not None:
-                discovery_message['cmps'][f'{vin}_light_state'] = {
-                    'p': 'binary_sensor',
-                    'name': 'Light State',
-                    'icon': 'mdi:car-light-dimmed',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.lights.light_state.get_absolute_path()}',
-                    'payload_off': 'off',
-                    'payload_on': 'on',
-                    'unique_id': f'{vin}_light_state'
-                }
-            for light_id, light in vehicle.lights.lights.items():
+                    if _has_value(window.open_state):
+                        uid = vin_ + window_id + '_window_open_state'
+                        cmps[uid] = self._discovery_component(WINDOW_OPEN_TEMPLATE, f'Window Open State ({window_id})', uid, attribute=window.open_state)
+        lights = vehicle.lights
+        if lights is not None and lights.enabled:
+            if _has_value(lights.light_state):
+                uid = vin_ + 'light_state'
+                cmps[uid] = self._discovery_component(LIGHT_STATE_TEMPLATE, 'Light State', uid, attribute=lights.light_state)
+            for light_id, light in lights.lights.items():
                 if light.enabled:
-                    if light.light_state.enabled and light.light_state.value is not None:
-                        discovery_message['cmps'][f'{vin}_{light_id}_state'] = {
-                            'p': 'binary_sensor',
-                            'name': f'Light State ({light_id})',
-                            'icon': 'mdi:car-light-dimmed',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{light.light_state.get_absolute_path()}',
-                            'payload_off': 'off',
-                            'payload_on': 'on',
-                            'unique_id': f'{vin}_{light_id}_state'
-                        }
-        if vehicle.window_heatings is not None and vehicle.window_heatings.enabled:
-            if vehicle.window_heatings.commands.enabled and 'start-stop' in vehicle.window_heatings.commands.commands \
-                    and vehicle.window_heatings.heating_state.enabled and vehicle.window_heatings.heating_state.value is not None:
-                discovery_message['cmps'][f'{vin}_window_heating_start_stop'] = {
-                    'p': 'switch',
-                    'name': 'Start/Stop Window Heating',
-                    'icon': 'mdi:car-defrost-front',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.window_heatings.heating_state.get_absolute_path()}',
-                    'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.window_heatings.commands.commands["start-stop"].get_absolute_path()}'
-                    + '_writetopic',
-                    'payload_on': 'start',
-                    'payload_off': 'stop',
-                    'state_on': 'on',
-                    'state_off': 'off',
-                    'unique_id': f'{vin}_window_heating_start_stop'
-                }
-            if vehicle.window_heatings.heating_state.enabled and vehicle.window_heatings.heating_state.value is not None:
-                discovery_message['cmps'][f'{vin}_window_heating_state'] = {
-                    'p': 'binary_sensor',
-                    'name': 'Window Heating State',
-                    'icon': 'mdi:car-defrost-front',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.window_heatings.heating_state.get_absolute_path()}',
-                    'payload_off': 'off',
-                    'payload_on': 'on',
-                    'unique_id': f'{vin}_window_heating_state'
-                }
-            for window_id, window in vehicle.window_heatings.windows.items():
+                    if _has_value(light.light_state):
+                        uid = vin_ + light_id + '_state'
+                        cmps[uid] = self._discovery_component(LIGHT_STATE_TEMPLATE, f'Light State ({light_id})', uid, attribute=light.light_state)
+        window_heatings = vehicle.window_heatings
+        if window_heatings is not None and window_heatings.enabled:
+            if window_heatings.commands.enabled and 'start-stop' in window_heatings.commands.commands \
+                    and _has_value(window_heatings.heating_state):
+                uid = vin_ + 'window_heating_start_stop'
+                cmps[uid] = self._discovery_component(
+                    WINDOW_HEATING_SWITCH_TEMPLATE, 'Start/Stop Window Heating', uid, attribute=window_heatings.heating_state,
+                    command_topic=write_topic(window_heatings.commands.commands['start-stop']))
+            if _has_value(window_heatings.heating_state):
+                uid = vin_ + 'window_heating_state'
+                cmps[uid] = self._discovery_component(WINDOW_HEATING_STATE_TEMPLATE, 'Window Heating State', uid, attribute=window_heatings.heating_state)
+            for window_id, window in window_heatings.windows.items():
                 if window.enabled:
-                    if window.heating_state.enabled and window.heating_state.value is not None:
-                        discovery_message['cmps'][f'{vin}_{window_id}_window_heating_state'] = {
-                            'p': 'binary_sensor',
-                            'name': f'Window Heating State ({window_id})',
-                            'icon': 'mdi:car-defrost-rear' if 'rear' in window_id else 'mdi:car-defrost-front',
-                            'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{window.heating_state.get_absolute_path()}',
-                            'payload_off': 'off',
-                            'payload_on': 'on',
-                            'unique_id': f'{vin}_{window_id}_window_heating_state'
-                        }
-
-        if vehicle.position.enabled:
-            # pylint: disable-next=too-many-boolean-expressions
-            if vehicle.position.latitude.enabled and vehicle.position.latitude.value is not None \
-                    and vehicle.position.longitude.enabled and vehicle.position.longitude.value is not None:
-                discovery_message['cmps'][f'{vin}_latitude'] = {
-                    'p': 'sensor',
-                    'state_class': 'measurement',
-                    'name': 'Position Latitude',
-                    'icon': 'mdi:latitude',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.position.latitude.get_absolute_path()}',
-                    'unique_id': f'{vin}_latitude'
-                }
-                if vehicle.position.latitude.unit is not None:
-                    _, unit = vehicle.position.latitude.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_latitude']['unit_of_measurement'] = unit.value
-                discovery_message['cmps'][f'{vin}_longitude'] = {
-                    'p': 'sensor',
-                    'state_class': 'measurement',
-                    'name': 'Position Longitude',
-                    'icon': 'mdi:longitude',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.position.longitude.get_absolute_path()}',
-                    'unique_id': f'{vin}_longitude'
-                }
-                if vehicle.position.longitude.unit is not None:
-                    _, unit = vehicle.position.longitude.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_longitude']['unit_of_measurement'] = unit.value
-            if vehicle.position.position_type.enabled and vehicle.position.position_type.value is not None:
-                discovery_message['cmps'][f'{vin}_position_type'] = {
-                    'p': 'sensor',
-                    'device_class': 'enum',
-                    'icon': 'mdi:map-marker',
-                    'name': 'Position Type',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.position.position_type.get_absolute_path()}',
-                    'unique_id': f'{vin}_position_type'
-                }
-                if vehicle.position.position_type.value_type is not None and issubclass(vehicle.position.position_type.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_position_type']['options'] = [item.value for item in vehicle.position.position_type.value_type]
-        if vehicle.climatization.enabled:
-            if vehicle.climatization.state.enabled and vehicle.climatization.state.value is not None:
-                discovery_message['cmps'][f'{vin}_climatization_state'] = {
-                    'p': 'sensor',
-                    'icon': 'mdi:air-conditioner',
-                    'device_class': 'enum',
-                    'name': 'Climatization State',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.state.get_absolute_path()}',
-                    'unique_id': f'{vin}_climatization_state'
-                }
-                if vehicle.climatization.state.value_type is not None and issubclass(vehicle.climatization.state.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_climatization_state']['options'] = \
-                        [item.value for item in vehicle.climatization.state.value_type]
-            if vehicle.climatization.commands.enabled and 'start-stop' in vehicle.climatization.commands.commands:
-                def __mode_to_command_hook(attribute: GenericAttribute, value: Any) -> Any:
-                    del attribute
-                    if value == 'off':
-                        return 'stop'
-                    if value == 'auto':
-                        return 'start'
-                    return value
+                    if _has_value(window.heating_state):
+                        uid = vin_ + window_id + '_window_heating_state'
+                        cmps[uid] = self._discovery_component(
+                            WINDOW_HEATING_STATE_TEMPLATE, f'Window Heating State ({window_id})', uid, attribute=window.heating_state,
+                            icon='mdi:car-defrost-rear' if 'rear' in window_id else 'mdi:car-defrost-front')
+
+        position: Position = vehicle.position
+        # Latitude, longitude and the device tracker all require both coordinates
+        has_coordinates: bool = position.enabled and _has_value(position.latitude) and _has_value(position.longitude)
+        if has_coordinates:
+            uid = vin_ + 'latitude'
+            cmps[uid] = self._discovery_component(LATITUDE_TEMPLATE, 'Position Latitude', uid, attribute=position.latitude)
+            uid = vin_ + 'longitude'
+            cmps[uid] = self._discovery_component(LONGITUDE_TEMPLATE, 'Position Longitude', uid, attribute=position.longitude)
+        if position.enabled:
+            self._add_descriptor_components(cmps, vin_, position, POSITION_COMPONENTS)
+        climatization = vehicle.climatization
+        if climatization.enabled:
+            self._add_descriptor_components(cmps, vin_, climatization, CLIMATIZATION_COMPONENTS)
+            if climatization.commands.enabled and 'start-stop' in climatization.commands.commands:
+                # The hook is a module-level function, so the attribute only registers it once across discovery rebuilds
                 # pylint: disable-next=protected-access
-                vehicle.climatization.commands.commands['start-stop']._add_on_set_hook(__mode_to_command_hook, early_hook=True)
-                discovery_message['cmps'][f'{vin}_climatization_start_stop'] = {
-                        'p': 'climate',
-                        'name': 'Start/Stop Climatization',
-                        'icon': 'mdi:air-conditioner',
-                        'action_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.get_absolute_path()}/hvac_action',
-                        'mode_command_topic':
-                        f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.commands.commands["start-stop"].get_absolute_path()}_writetopic',
-                        'mode_state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.get_absolute_path()}/hvac_mode',
-                        'modes': ['off', 'auto'],
-                        'power_command_topic':
-                        f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.commands.commands["start-stop"].get_absolute_path()}'
-                        + '_writetopic',
-                        'payload_on': 'start',
-                        'payload_off': 'stop',
-                        'unique_id': f'{vin}_climatization_start_stop'
-                    }
-            if vehicle.climatization.settings.enabled and vehicle.climatization.settings.target_temperature.enabled \
-                    and f'{vin}_climatization_start_stop' in discovery_message['cmps']:
-                if vehicle.climatization.settings.target_temperature.value is not None:
-                    discovery_message['cmps'][f'{vin}_climatization_start_stop']['temperature_state_topic'] = \
-                        f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.settings.target_temperature.get_absolute_path()}'
-                if vehicle.climatization.settings.target_temperature.maximum is not None:
-                    discovery_message['cmps'][f'{vin}_climatization_start_stop']['max_temp'] = vehicle.climatization.settings.target_temperature.maximum
-                if vehicle.climatization.settings.target_temperature.minimum is not None:
-                    discovery_message['cmps'][f'{vin}_climatization_start_stop']['min_temp'] = vehicle.climatization.settings.target_temperature.minimum
-                if vehicle.climatization.settings.target_temperature.precision is not None:
-                    discovery_message['cmps'][f'{vin}_climatization_start_stop']['temp_step'] = vehicle.climatization.settings.target_temperature.precision
-                if vehicle.climatization.settings.target_temperature.is_changeable:
-                    discovery_message['cmps'][f'{vin}_climatization_start_stop']['temperature_command_topic'] = \
-                        f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.settings.target_temperature.get_absolute_path()}_writetopic'
-                if vehicle.climatization.settings.target_temperature.unit is not None:
-                    _, unit = vehicle.climatization.settings.target_temperature.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
+                climatization.commands.commands['start-stop']._add_on_set_hook(_mode_to_command_hook, early_hook=True)
+                uid = vin_ + 'climatization_start_stop'
+                climatization_topic: str = topic(climatization)
+                start_stop_topic: str = write_topic(climatization.commands.commands['start-stop'])
+                cmps[uid] = self._discovery_component(
+                    CLIMATE_TEMPLATE, 'Start/Stop Climatization', uid, action_topic=climatization_topic + '/hvac_action', mode_command_topic=start_stop_topic,
+                    mode_state_topic=climatization_topic + '/hvac_mode', power_command_topic=start_stop_topic)
+            uid = vin_ + 'climatization_start_stop'
+            target_temperature = climatization.settings.target_temperature
+            if climatization.settings.enabled and target_temperature.enabled and uid in cmps:
+                climate: Dict[str, Any] = cmps[uid]
+                if target_temperature.value is not None:
+                    climate['temperature_state_topic'] = topic(target_temperature)
+                if target_temperature.maximum is not None:
+                    climate['max_temp'] = target_temperature.maximum
+                if target_temperature.minimum is not None:
+                    climate['min_temp'] = target_temperature.minimum
+                if target_temperature.precision is not None:
+                    climate['temp_step'] = target_temperature.precision
+                if target_temperature.is_changeable:
+                    climate['temperature_command_topic'] = write_topic(target_temperature)
+                if target_temperature.unit is not None:
+                    _, unit = target_temperature.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
                     if unit is not None:
                         if unit == Temperature.C:
-                            discovery_message['cmps'][f'{vin}_climatization_start_stop']['temperature_unit'] = 'C'
+                            climate['temperature_unit'] = 'C'
                         elif unit == Temperature.F:
-                            discovery_message['cmps'][f'{vin}_climatization_start_stop']['temperature_unit'] = 'F'
-            if vehicle.climatization.estimated_date_reached.enabled and vehicle.climatization.estimated_date_reached.value is not None:
-                discovery_message['cmps'][f'{vin}_climatization_estimated_date_reached'] = {
-                    'p': 'sensor',
-                    'device_class': 'timestamp',
-                    'icon': 'mdi:clock-end',
-                    'name': 'Climatization Estimated Date Reached',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.climatization.estimated_date_reached.get_absolute_path()}',
-                    'unique_id': f'{vin}_climatization_estimated_date_reached'
-                }
-        if vehicle.outside_temperature.enabled and vehicle.outside_temperature.value is not None:
-            discovery_message['cmps'][f'{vin}_outside_temperature'] = {
-                'p': 'sensor',
-                'device_class': 'temperature',
-                'state_class': 'measurement',
-                'icon': 'mdi:sun-thermometer-outline',
-                'name': 'Outside Temperature',
-                'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.outside_temperature.get_absolute_path()}',
-                'unique_id': f'{vin}_outside_temperature'
-            }
-            if vehicle.outside_temperature.unit is not None:
-                _, unit = vehicle.outside_temperature.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                if unit is not None:
-                    discovery_message['cmps'][f'{vin}_outside_temperature']['unit_of_measurement'] = unit.value
+                            climate['temperature_unit'] = 'F'
         if vehicle.maintenance.enabled:
-            if vehicle.maintenance.inspection_due_at.enabled and vehicle.maintenance.inspection_due_at.value is not None:
-                discovery_message['cmps'][f'{vin}_inspection_due_at'] = {
-                    'p': 'sensor',
-                    'device_class': 'timestamp',
-                    'icon': 'mdi:tools',
-                    'name': 'Inspection Due At',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.maintenance.inspection_due_at.get_absolute_path()}',
-                    'unique_id': f'{vin}_inspection_due_at'
-                }
-            if vehicle.maintenance.inspection_due_after.enabled and vehicle.maintenance.inspection_due_after.value is not None:
-                discovery_message['cmps'][f'{vin}_inspection_due_after'] = {
-                    'p': 'sensor',
-                    'device_class': 'distance',
-                    'state_class': 'measurement',
-                    'icon': 'mdi:tools',
-                    'name': 'Inspection Due After',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.maintenance.inspection_due_after.get_absolute_path()}',
-                    'unique_id': f'{vin}_inspection_due_after'
-                }
-                if vehicle.maintenance.inspection_due_after.unit is not None:
-                    _, unit = vehicle.maintenance.inspection_due_after.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_inspection_due_after']['unit_of_measurement'] = unit.value
-            if vehicle.maintenance.oil_service_due_at.enabled and vehicle.maintenance.oil_service_due_at.value is not None:
-                discovery_message['cmps'][f'{vin}_oil_service_due_at'] = {
-                    'p': 'sensor',
-                    'device_class': 'timestamp',
-                    'icon': 'mdi:oil',
-                    'name': 'Oil Service Due At',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.maintenance.oil_service_due_at.get_absolute_path()}',
-                    'unique_id': f'{vin}_oil_service_due_at'
-                }
-            if vehicle.maintenance.oil_service_due_after.enabled and vehicle.maintenance.oil_service_due_after.value is not None:
-                discovery_message['cmps'][f'{vin}_oil_service_due_after'] = {
-                    'p': 'sensor',
-                    'device_class': 'distance',
-                    'state_class': 'measurement',
-                    'icon': 'mdi:oil',
-                    'name': 'Oil Service Due After',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.maintenance.oil_service_due_after.get_absolute_path()}',
-                    'unique_id': f'{vin}_oil_service_due_after'
-                }
-                if vehicle.maintenance.oil_service_due_after.unit is not None:
-                    _, unit = vehicle.maintenance.oil_service_due_after.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_oil_service_due_after']['unit_of_measurement'] = unit.value
-        if SUPPORT_IMAGES and self.mqtt_plugin.mqtt_client.image_format == ImageFormat.PNG:
-            if vehicle.images.enabled:
-                for image_id, image in vehicle.images.images.items():
-                    if image.enabled and image.value is not None:
-                        discovery_message['cmps'][f'{vin}_{image_id}_image'] = {
-                            'p': 'image',
-                            'name': f'Image ({image_id})',
-                            'image_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{image.get_absolute_path()}',
-                            'content_type': 'image/png',
-                            'unique_id': f'{vin}_{image_id}_image'
-                        }
+            self._add_descriptor_components(cmps, vin_, vehicle.maintenance, MAINTENANCE_COMPONENTS)
+        if self._announce_images and vehicle.images.enabled:
+            for image_id, image in vehicle.images.images.items():
+                if _has_value(image):
+                    uid = vin_ + image_id + '_image'
+                    cmps[uid] = self._discovery_component(IMAGE_TEMPLATE, f'Image ({image_id})', uid, image_topic=topic(image))
         if isinstance(vehicle, ElectricVehicle):  # pylint: disable=too-many-nested-blocks
-            if vehicle.charging.connector.connection_state.enabled and vehicle.charging.connector.connection_state.value is not None:
-                if vehicle.charging.commands.enabled and 'start-stop' in vehicle.charging.commands.commands \
-                        and vehicle.charging.state.enabled and vehicle.charging.state.value is not None:
-                    discovery_message['cmps'][f'{vin}_charging_start_stop'] = {
-                        'p': 'switch',
-                        'name': 'Start/Stop Charging',
-                        'icon': 'mdi:ev-station',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.get_absolute_path()}/binarystate',
-                        'command_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.commands.commands["start-stop"].get_absolute_path()}'
-                        + '_writetopic',
-                        'payload_on': 'start',
-                        'payload_off': 'stop',
-                        'state_on': 'on',
-                        'state_off': 'off',
-                        'unique_id': f'{vin}_charging_start_stop'
-                    }
-                discovery_message['cmps'][f'{vin}_charging_connector_state'] = {
-                    'p': 'sensor',
-                    'device_class': 'enum',
-                    'icon': 'mdi:ev-station',
-                    'name': 'Charging Connector State',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.connector.connection_state.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_connector_state'
-                }
-                if vehicle.charging.connector.connection_state.value_type is not None \
-                        and issubclass(vehicle.charging.connector.connection_state.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_charging_connector_state']['options'] = \
-                        [item.value for item in vehicle.charging.connector.connection_state.value_type]
-            if vehicle.charging.connector.lock_state.enabled and vehicle.charging.connector.lock_state.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_connector_lock_state'] = {
-                    'p': 'binary_sensor',
-                    'device_class': 'lock',
-                    'icon': 'mdi:lock',
-                    'name': 'Charging Connector Lock State',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.connector.lock_state.get_absolute_path()}',
-                    'payload_on': 'unlocked',
-                    'payload_off': 'locked',
-                    'unique_id': f'{vin}_charging_connector_lock_state'
-                }
-            if vehicle.charging.connector.external_power.enabled and vehicle.charging.connector.external_power.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_connector_external_power'] = {
-                    'p': 'sensor',
-                    'device_class': 'enum',
-                    'icon': 'mdi:lightning-bolt',
-                    'name': 'Charging Connector External Power',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.connector.external_power.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_connector_external_power'
-                }
-                if vehicle.charging.connector.external_power.value_type is not None and issubclass(vehicle.charging.connector.external_power.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_charging_connector_external_power']['options'] = \
-                        [item.value for item in vehicle.charging.connector.external_power.value_type]
-            if vehicle.charging.state.enabled and vehicle.charging.state.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_state'] = {
-                    'p': 'sensor',
-                    'device_class': 'enum',
-                    'icon': 'mdi:battery-charging',
-                    'name': 'Charging State',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.state.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_state'
-                }
-                if vehicle.charging.state.value_type is not None and issubclass(vehicle.charging.state.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_charging_state']['options'] = [item.value for item in vehicle.charging.state.value_type]
-            if vehicle.charging.type.enabled and vehicle.charging.type.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_type'] = {
-                    'p': 'sensor',
-                    'device_class': 'enum',
-                    'icon': 'mdi:current-ac',
-                    'name': 'Charging Type',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.type.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_type'
-                }
-                if vehicle.charging.type.value_type is not None and issubclass(vehicle.charging.type.value_type, Enum):
-                    discovery_message['cmps'][f'{vin}_charging_type']['options'] = [item.value for item in vehicle.charging.type.value_type]
-            if vehicle.charging.rate.enabled and vehicle.charging.rate.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_rate'] = {
-                    'p': 'sensor',
-                    'device_class': 'speed',
-                    'state_class': 'measurement',
-                    'icon': 'mdi:speedometer',
-                    'name': 'Charging Rate',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.rate.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_rate'
-                }
-                if vehicle.charging.rate.unit is not None:
-                    _, unit = vehicle.charging.rate.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_charging_rate']['unit_of_measurement'] = unit.value
-            if vehicle.charging.power.enabled and vehicle.charging.power.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_power'] = {
-                    'p': 'sensor',
-                    'device_class': 'power',
-                    'state_class': 'measurement',
-                    'icon': 'mdi:speedometer',
-                    'name': 'Charging Power',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.power.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_power'
-                }
-                if vehicle.charging.power.unit is not None:
-                    _, unit = vehicle.charging.power.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                    if unit is not None:
-                        discovery_message['cmps'][f'{vin}_charging_power']['unit_of_measurement'] = unit.value
-            if vehicle.charging.estimated_date_reached.enabled and vehicle.charging.estimated_date_reached.value is not None:
-                discovery_message['cmps'][f'{vin}_charging_estimated_date_reached'] = {
-                    'p': 'sensor',
-                    'device_class': 'timestamp',
-                    'icon': 'mdi:clock-end',
-                    'name': 'Charging Estimated Date Reached',
-                    'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.estimated_date_reached.get_absolute_path()}',
-                    'unique_id': f'{vin}_charging_estimated_date_reached'
-                }
-            if vehicle.charging.settings is not None:
-                if vehicle.charging.settings.target_level.enabled and vehicle.charging.settings.target_level.value is not None:
-                    discovery_message['cmps'][f'{vin}_charging_target_level'] = {
-                        'p': 'sensor',
-                        'state_class': 'measurement',
-                        'icon': 'mdi:battery',
-                        'name': 'Charging Target Level',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.target_level.get_absolute_path()}',
-                        'unique_id': f'{vin}_charging_target_level'
-                    }
-                    if vehicle.charging.settings.target_level.is_changeable:
-                        discovery_message['cmps'][f'{vin}_charging_target_level']['p'] = 'number'
-                        discovery_message['cmps'][f'{vin}_charging_target_level']['command_topic'] = \
-                            f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.target_level.get_absolute_path()}_writetopic'
-                        if vehicle.charging.settings.target_level.minimum is not None:
-                            discovery_message['cmps'][f'{vin}_charging_target_level']['min'] = vehicle.charging.settings.target_level.minimum
-                        if vehicle.charging.settings.target_level.maximum is not None:
-                            discovery_message['cmps'][f'{vin}_charging_target_level']['max'] = vehicle.charging.settings.target_level.maximum
-                        if vehicle.charging.settings.target_level.precision is not None:
-                            discovery_message['cmps'][f'{vin}_charging_target_level']['step'] = vehicle.charging.settings.target_level.precision
-                        if vehicle.charging.settings.target_level.unit is not None:
-                            _, unit = vehicle.charging.settings.target_level.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                            if unit is not None:
-                                discovery_message['cmps'][f'{vin}_charging_target_level']['unit_of_measurement'] = unit.value
-                if vehicle.charging.settings.maximum_current.enabled and vehicle.charging.settings.maximum_current.value is not None:
-                    discovery_message['cmps'][f'{vin}_charging_maximum_current'] = {
-                        'p': 'sensor',
-                        'device_class': 'current',
-                        'state_class': 'measurement',
-                        'icon': 'mdi:speedometer',
-                        'name': 'Charging Maximum Current',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.maximum_current.get_absolute_path()}',
-                        'unique_id': f'{vin}_charging_maximum_current'
-                    }
-                    if vehicle.charging.settings.maximum_current.is_changeable:
-                        discovery_message['cmps'][f'{vin}_charging_maximum_current']['p'] = 'number'
-                        discovery_message['cmps'][f'{vin}_charging_maximum_current']['command_topic'] = \
-                            f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.maximum_current.get_absolute_path()}_writetopic'
-                        if vehicle.charging.settings.maximum_current.minimum is not None:
-                            discovery_message['cmps'][f'{vin}_charging_maximum_current']['min'] = vehicle.charging.settings.maximum_current.minimum
-                        if vehicle.charging.settings.maximum_current.maximum is not None:
-                            discovery_message['cmps'][f'{vin}_charging_maximum_current']['max'] = vehicle.charging.settings.maximum_current.maximum
-                        if vehicle.charging.settings.maximum_current.precision is not None:
-                            discovery_message['cmps'][f'{vin}_charging_maximum_current']['step'] = vehicle.charging.settings.maximum_current.precision
-                        if vehicle.charging.settings.maximum_current.unit is not None:
-                            _, unit = vehicle.charging.settings.maximum_current.in_locale(locale=self.mqtt_plugin.mqtt_client.locale)
-                            if unit is not None:
-                                discovery_message['cmps'][f'{vin}_charging_maximum_current']['unit_of_measurement'] = unit.value
-                if vehicle.charging.settings.auto_unlock.enabled and vehicle.charging.settings.auto_unlock.value is not None:
-                    discovery_message['cmps'][f'{vin}_charging_auto_unlock'] = {
-                        'p': 'binary_sensor',
-                        'name': 'Auto unlock charging connector',
-                        'icon': 'mdi:lock',
-                        'state_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.auto_unlock.get_absolute_path()}',
-                        'state_on': 'on',
-                        'state_off': 'off',
-                        'unique_id': f'{vin}_charging_auto_unlock'
-                    }
-                    if vehicle.charging.settings.auto_unlock.is_changeable:
-                        discovery_message['cmps'][f'{vin}_charging_auto_unlock']['p'] = 'switch'
-                        discovery_message['cmps'][f'{vin}_charging_auto_unlock']['command_topic'] = \
-                            f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.charging.settings.auto_unlock.get_absolute_path()}_writetopic'
-                        discovery_message['cmps'][f'{vin}_charging_auto_unlock']['payload_on'] = 'on'
-                        discovery_message['cmps'][f'{vin}_charging_auto_unlock']['payload_off'] = 'off'
-        if vehicle.position.enabled and vehicle.position.latitude.enabled and vehicle.position.latitude.value is not None \
-                and vehicle.position.longitude.enabled and vehicle.position.longitude.value is not None:
-            discovery_message['cmps'][f'{vin}_position'] = {
-                'p': 'device_tracker',
-                'icon': 'mdi:map-marker',
-                'name': 'Position',
-                'json_attributes_topic': f'{self.mqtt_plugin.mqtt_client.prefix}{vehicle.position.get_absolute_path()}/attributes',
-                'source_type': 'gps',
-                'unique_id': f'{vin}_position'
-            }
-        for sensor in discovery_message['cmps'].values():
-            sensor['availability'] = [{
-                'topic': f'{self.mqtt_plugin.mqtt_client.prefix}{self.mqtt_plugin.connection_state.get_absolute_path()}',
-                'payload_not_available': 'disconnected',
-                'payload_available': 'connected',
-                }]
-        discovery_hash = hash(json.dumps(discovery_message))
-        if vin not in self.homeassistant_discovery_hashes or self.homeassistant_discovery_hashes[vin] != discovery_hash \
-                or force:
+            charging = vehicle.charging
+            connection_state = charging.connector.connection_state
+            if _has_value(connection_state):
+                if charging.commands.enabled and 'start-stop' in charging.commands.commands and _has_value(charging.state):
+                    uid = vin_ + 'charging_start_stop'
+                    cmps[uid] = self._discovery_component(
+                        CHARGING_SWITCH_TEMPLATE, 'Start/Stop Charging', uid, state_topic=topic(charging) + '/binarystate',
+                        command_topic=write_topic(charging.commands.commands['start-stop']))
+                uid = vin_ + 'charging_connector_state'
+                cmps[uid] = self._discovery_component(CHARGING_CONNECTOR_STATE_TEMPLATE, 'Charging Connector State', uid, attribute=connection_state)
+                if _is_enum_type(connection_state.value_type):
+                    cmps[uid]['options'] = _enum_options(connection_state.value_type)
+            self._add_descriptor_components(cmps, vin_, charging, CHARGING_COMPONENTS)
+            settings = charging.settings
+            if settings is not None:
+                target_level = settings.target_level
+                if _has_value(target_level):
+                    uid = vin_ + 'charging_target_level'
+                    cmps[uid] = self._discovery_component(CHARGING_TARGET_LEVEL_TEMPLATE, 'Charging Target Level', uid, state_topic=topic(target_level))
+                    if target_level.is_changeable:
+                        cmps[uid]['p'] = 'number'
+                        cmps[uid]['command_topic'] = write_topic(target_level)
+                        if target_level.minimum is not None:
+                            cmps[uid]['min'] = target_level.minimum
+                        if target_level.maximum is not None:
+                            cmps[uid]['max'] = target_level.maximum
+                        if target_level.precision is not None:
+                            cmps[uid]['step'] = target_level.precision
+                        unit_of_measurement: Optional[str] = self._unit_of_measurement(target_level)
+                        if unit_of_measurement is not None:
+                            cmps[uid]['unit_of_measurement'] = unit_of_measurement
+                maximum_current = settings.maximum_current
+                if _has_value(maximum_current):
+                    uid = vin_ + 'charging_maximum_current'
+                    cmps[uid] = self._discovery_component(
+                        CHARGING_MAXIMUM_CURRENT_TEMPLATE, 'Charging Maximum Current', uid,
+                        state_topic=topic(maximum_current))
+                    if maximum_current.is_changeable:
+                        cmps[uid]['p'] = 'number'
+                        cmps[uid]['command_topic'] = write_topic(maximum_current)
+                        if maximum_current.minimum is not None:
+                            cmps[uid]['min'] = maximum_current.minimum
+                        if maximum_current.maximum is not None:
+                            cmps[uid]['max'] = maximum_current.maximum
+                        if maximum_current.precision is not None:
+                            cmps[uid]['step'] = maximum_current.precision
+                        unit_of_measurement = self._unit_of_measurement(maximum_current)
+                        if unit_of_measurement is not None:
+                            cmps[uid]['unit_of_measurement'] = unit_of_measurement
+                auto_unlock = settings.auto_unlock
+                if _has_value(auto_unlock):
+                    uid = vin_ + 'charging_auto_unlock'
+                    cmps[uid] = self._discovery_component(AUTO_UNLOCK_TEMPLATE, 'Auto unlock charging connector', uid, attribute=auto_unlock)
+                    if auto_unlock.is_changeable:
+                        cmps[uid]['p'] = 'switch'
+                        cmps[uid]['command_topic'] = write_topic(auto_unlock)
+                        cmps[uid]['payload_on'] = 'on'
+                        cmps[uid]['payload_off'] = 'off'
+        if has_coordinates:
+            uid = vin_ + 'position'
+            cmps[uid] = self._discovery_component(DEVICE_TRACKER_TEMPLATE, 'Position', uid, json_attributes_topic=topic(position) + '/attributes')
+        discovery_message['cmps'] = {component_id: _abbreviate(component) for component_id, component in cmps.items()}
+        payload: bytes = _json_dumps(discovery_message)
+        discovery_hash: bytes = hashlib.blake2b(payload, digest_size=16).digest()
+        if force or self.homeassistant_discovery_hashes.get(vin) != discovery_hash:
             self.homeassistant_discovery_hashes[vin] = discovery_hash
             LOG.debug("Publishing Home Assistant discovery message for vehicle %s", vin)
-            self.mqtt_plugin.mqtt_client.publish(topic=discovery_topic, qos=1, retain=False, payload=json.dumps(discovery_message, indent=4))
+            self.mqtt_plugin.mqtt_client.publish(topic=discovery_topic, qos=1, retain=True, payload=payload)
+
+    def __register_topics(self, mqtt_client: CarConnectivityMQTTClient, *topics: str) -> None:
+        """
+        Register extra topics with the MQTT client, topics that were registered before are skipped.
+
+        The MQTT client checks its sorted topic list on every call, so this avoids the lookups for every state event.
+
+        Args:
+            mqtt_client (CarConnectivityMQTTClient): The MQTT client to register the topics with.
+            *topics (str): The topics to register.
+        """
+        for topic in topics:
+            if topic not in self._registered_topics:
+                #  pylint: disable-next=protected-access
+                mqtt_client._add_topic(topic=topic, with_filter=True, subscribe=False, writeable=False)
+                self._registered_topics.add(topic)
 
     def __send_position_extra_targets(self, position: Position) -> None:
         if self.mqtt_plugin is None:
             LOG.critical("MQTT plugin is None")
-        elif position.latitude.enabled and position.latitude.value is not None \
-                and position.longitude.enabled and position.longitude.value is not None:
-            topic: str = f'{self.mqtt_plugin.mqtt_client.prefix}{position.get_absolute_path()}/attributes'
-            #  pylint: disable-next=protected-access
-            self.mqtt_plugin.mqtt_client._add_topic(topic=topic, with_filter=True, subscribe=False, writeable=False)
+        elif _has_value(position.latitude) and _has_value(position.longitude):
+            mqtt_client = self.mqtt_plugin.mqtt_client
+            topic: str = self._element_topic(position) + '/attributes'
+            self.__register_topics(mqtt_client, topic)
             payload: Dict[str, float] = {
                 'latitude': position.latitude.value,
                 'longitude': position.longitude.value
             }
-            self.mqtt_plugin.mqtt_client.publish(topic=topic, qos=1, retain=True, payload=json.dumps(payload))
+            mqtt_client.publish(topic=topic, qos=1, retain=True, payload=_json_dumps(payload))
 
     def __send_charging_binary_state(self, charging_state: EnumAttribute[Charging.ChargingState]) -> None:
         if self.mqtt_plugin is None:
             LOG.critical("MQTT plugin is None")
-        elif charging_state.enabled and charging_state.value is not None:
-            topic: str = f'{self.mqtt_plugin.mqtt_client.prefix}{charging_state.parent.get_absolute_path()}/binarystate'
-            #  pylint: disable-next=protected-access
-            self.mqtt_plugin.mqtt_client._add_topic(topic=topic, with_filter=True, subscribe=False, writeable=False)
+        elif _has_value(charging_state):
+            mqtt_client = self.mqtt_plugin.mqtt_client
+            topic: str = self._element_topic(charging_state.parent) + '/binarystate'
+            self.__register_topics(mqtt_client, topic)
             payload: str = ''
-            if charging_state.value in [Charging.ChargingState.CHARGING, Charging.ChargingState.CONSERVATION, Charging.ChargingState.DISCHARGING]:
+            if charging_state.value in CHARGING_STATES_ON:
                 payload = 'on'
-            elif charging_state.value in [Charging.ChargingState.OFF, Charging.ChargingState.READY_FOR_CHARGING, Charging.ChargingState.ERROR]:
+            elif charging_state.value in CHARGING_STATES_OFF:
                 payload = 'off'
-            self.mqtt_plugin.mqtt_client.publish(topic=topic, qos=1, retain=True, payload=payload)
+            mqtt_client.publish(topic=topic, qos=1, retain=True, payload=payload)
 
     def __send_climatization_binary_state(self, climatization_state: EnumAttribute[Climatization.ClimatizationState]) -> None:
         if self.mqtt_plugin is None:
             LOG.critical("MQTT plugin is None")
-        elif climatization_state.enabled and climatization_state.value is not None:
-            topic: str = f'{self.mqtt_plugin.mqtt_client.prefix}{climatization_state.parent.get_absolute_path()}/binarystate'
-            #  pylint: disable-next=protected-access
-            self.mqtt_plugin.mqtt_client._add_topic(topic=topic, with_filter=True, subscribe=False, writeable=False)
+        elif _has_value(climatization_state):
+            mqtt_client = self.mqtt_plugin.mqtt_client
+            topic: str = self._element_topic(climatization_state.parent) + '/binarystate'
+            self.__register_topics(mqtt_client, topic)
             payload: str = ''
-            if climatization_state.value in [Climatization.ClimatizationState.HEATING,
-                                             Climatization.ClimatizationState.COOLING,
-                                             Climatization.ClimatizationState.VENTILATION]:
+            if climatization_state.value in CLIMATIZATION_STATES_ON:
                 payload = 'on'
-            elif climatization_state.value in [Climatization.ClimatizationState.OFF]:
+            elif climatization_state.value in CLIMATIZATION_STATES_OFF:
                 payload = 'off'
-            self.mqtt_plugin.mqtt_client.publish(topic=topic, qos=1, retain=True, payload=payload)
+            mqtt_client.publish(topic=topic, qos=1, retain=True, payload=payload)
 
     def __send_climatization_hvac_topics(self, climatization_state: EnumAttribute[Climatization.ClimatizationState]) -> None:
         if self.mqtt_plugin is None:
             LOG.critical("MQTT plugin is None")
-        elif climatization_state.enabled and climatization_state.value is not None:
-            action_topic: str = f'{self.mqtt_plugin.mqtt_client.prefix}{climatization_state.parent.get_absolute_path()}/hvac_action'
-            mode_topic: str = f'{self.mqtt_plugin.mqtt_client.prefix}{climatization_state.parent.get_absolute_path()}/hvac_mode'
-            #  pylint: disable-next=protected-access
-            self.mqtt_plugin.mqtt_client._add_topic(topic=action_topic, with_filter=True, subscribe=False, writeable=False)
-            #  pylint: disable-next=protected-access
-            self.mqtt_plugin.mqtt_client._add_topic(topic=mode_topic, with_filter=True, subscribe=False, writeable=False)
-            action_payload: str = ''
-            mode_payload: str = ''
-            if climatization_state.value == Climatization.ClimatizationState.HEATING:
-                action_payload = 'heating'
-                mode_payload = 'auto'
-            elif climatization_state.value == Climatization.ClimatizationState.COOLING:
-                action_payload = 'cooling'
-                mode_payload = 'auto'
-            elif climatization_state.value == Climatization.ClimatizationState.VENTILATION:
-                action_payload = 'fan'
-                mode_payload = 'auto'
-            elif climatization_state.value in [Climatization.ClimatizationState.OFF]:
-                action_payload = 'off'
-                mode_payload = 'off'
-            self.mqtt_plugin.mqtt_client.publish(topic=action_topic, qos=1, retain=True, payload=action_payload)
-            self.mqtt_plugin.mqtt_client.publish(topic=mode_topic, qos=1, retain=True, payload=mode_payload)
+        elif _has_value(climatization_state):
+            mqtt_client = self.mqtt_plugin.mqtt_client
+            climatization_topic: str = self._element_topic(climatization_state.parent)
+            action_topic: str = climatization_topic + '/hvac_action'
+            mode_topic: str = climatization_topic + '/hvac_mode'
+            self.__register_topics(mqtt_client, action_topic, mode_topic)
+            action_payload, mode_payload = CLIMATIZATION_HVAC_STATES.get(climatization_state.value, ('', ''))
+            mqtt_client.publish(topic=action_topic, qos=1, retain=True, payload=action_payload)
+            mqtt_client.publish(topic=mode_topic, qos=1, retain=True, payload=mode_payload)
+
+    def _schedule_discovery(self, vehicle: Optional[GenericVehicle]) -> None:
+        """
+        Schedule publishing of discovery messages after a short delay.
+
+        Events arriving within the delay restart it, so a burst of events results in a single publish.
+
+        Args:
+            vehicle (Optional[GenericVehicle]): The vehicle to publish the discovery message for or None to publish all discovery messages.
+
+        Returns:
+            None
+        """
+        with self._discovery_lock:
+            if vehicle is None:
+                self._pending_discovery_all = True
+            else:
+                self._pending_discovery_vehicles.add(vehicle)
+            if self._discovery_timer is not None:
+                self._discovery_timer.cancel()
+            self._discovery_timer = threading.Timer(DISCOVERY_DEBOUNCE_DELAY, self._publish_pending_discovery)
+            self._discovery_timer.daemon = True
+            self._discovery_timer.start()
+
+    def _cancel_pending_discovery(self) -> None:
+        """
+        Cancel discovery messages scheduled by _schedule_discovery, e.g. because all discovery messages are published anyway.
+
+        Returns:
+            None
+        """
+        with self._discovery_lock:
+            if self._discovery_timer is not None:
+                self._discovery_timer.cancel()
+                self._discovery_timer = None
+            self._pending_discovery_all = False
+            self._pending_discovery_vehicles = set()
+
+    def _publish_pending_discovery(self) -> None:
+        """
+        Publish the discovery messages scheduled by _schedule_discovery.
+
+        Returns:
+            None
+        """
+        with self._discovery_lock:
+            self._discovery_timer = None
+            publish_all: bool = self._pending_discovery_all
+            vehicles: Set[GenericVehicle] = self._pending_discovery_vehicles
+            self._pending_discovery_all = False
+            self._pending_discovery_vehicles = set()
+        if publish_all:
+            self._publish_homeassistant_discovery()
+        else:
+            for vehicle in vehicles:
+                if vehicle.enabled:
+                    self._publish_homeassistant_discovery_vehicle(vehicle)
 
     def _on_carconnectivity_event(self, element, flags) -> None:
         """
         Callback for car connectivity events.
-        On enable of an attribute it will republish the device discovery message.
+        On enable or disable of an attribute it will republish the discovery message of the device the attribute belongs to.
 
         Args:
             element (Observable): The element that triggered the event.
@@ -1150,28 +1029,38 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         Returns:
             None
         """
-        # An attribute is enabled
-        if flags & Observable.ObserverEvent.ENABLED:
-            self._publish_homeassistant_discovery()
-        if flags & (Observable.ObserverEvent.ENABLED | Observable.ObserverEvent.VALUE_CHANGED):
-            if self.mqtt_plugin is None:
-                LOG.critical("MQTT plugin is None")
-            else:
-                # Generate position topic with latitude and longitude in same payload
-                if isinstance(element, FloatAttribute) and element.id == 'longitude' and element.value is not None \
-                        and isinstance(element.parent, Position):
-                    self.__send_position_extra_targets(element.parent)
-                elif isinstance(element, EnumAttribute) and element.id == 'state' and element.value_type == Charging.ChargingState:
-                    self.__send_charging_binary_state(element)
-                elif isinstance(element, EnumAttribute) and element.id == 'state' and element.value_type == Climatization.ClimatizationState:
-                    self.__send_climatization_binary_state(element)
-                    self.__send_climatization_hvac_topics(element)
+        if self.mqtt_plugin is None:
+            LOG.critical("MQTT plugin is None")
+            return
+        if flags & (Observable.ObserverEvent.ENABLED | Observable.ObserverEvent.DISABLED):
+            self._discovery_changed = True
+        # Disabled elements may be removed, do not keep them alive in the topic cache
+        if flags & Observable.ObserverEvent.DISABLED:
+            self._element_topics.pop(element, None)
+        # Nothing can be published while disconnected, discovery and extra topics are sent again after (re)connecting
+        if not self.mqtt_plugin.mqtt_client.is_connected():
+            return
+        # An attribute is enabled or disabled, only then the discovery message can change
+        if flags & (Observable.ObserverEvent.ENABLED | Observable.ObserverEvent.DISABLED):
+            # Only the discovery message of the vehicle the element belongs to is affected
+            self._schedule_discovery(_owning_vehicle(element))
+        # Most events are value changes of attributes without extra topics, the id check filters them before any type checks
+        if flags & (Observable.ObserverEvent.ENABLED | Observable.ObserverEvent.VALUE_CHANGED) and element.id in EXTRA_TOPIC_ELEMENT_IDS:
+            # Generate position topic with latitude and longitude in same payload
+            if isinstance(element, FloatAttribute) and element.id == 'longitude' and element.value is not None \
+                    and isinstance(element.parent, Position):
+                self.__send_position_extra_targets(element.parent)
+            elif isinstance(element, EnumAttribute) and element.id == 'state' and element.value_type == Charging.ChargingState:
+                self.__send_charging_binary_state(element)
+            elif isinstance(element, EnumAttribute) and element.id == 'state' and element.value_type == Climatization.ClimatizationState:
+                self.__send_climatization_binary_state(element)
+                self.__send_climatization_hvac_topics(element)
 
     def _on_message_callback(self, mqttc, obj, msg) -> None:  # noqa: C901
         """
         Callback for receiving a message from the MQTT broker.
 
-        It will publish the discovery messages on receiving a 'online' message on homeassistant/status messages
+        It will publish the discovery messages on receiving a 'online' message on the Home Assistant status topic (<homeassistant_prefix>/status)
 
         Args:
             mqttc (paho.mqtt.client.Client): unused
@@ -1183,8 +1072,8 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         """
         del mqttc
         del obj
-        if msg.topic == f'{self.active_config["homeassistant_prefix"]}/status':
-            if self.homeassistant_discovery and msg.payload.lower() == b'online':
+        if msg.topic == self._status_topic:
+            if self.homeassistant_discovery and msg.payload in HOMEASSISTANT_ONLINE_PAYLOADS:
                 self._publish_homeassistant_discovery(force=True)
 
     # pylint: disable-next=too-many-arguments, too-many-positional-arguments
@@ -1196,7 +1085,7 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         Args:
             mqttc (paho.mqtt.client.Client): unused
             obj (Any): unused
-            flags (Any): unused
+            flags (paho.mqtt.client.ConnectFlags): The connect flags, used to find out if the broker kept the session.
             reason_code (int): unused
             properties (Any): unused
 
@@ -1205,22 +1094,25 @@ class Plugin(BasePlugin):  # pylint: disable=too-many-instance-attributes
         """
         del mqttc
         del obj
-        del flags
         del properties
         # reason_code 0 means success
         if reason_code == 0:
             if self.homeassistant_discovery:
                 if self.mqtt_plugin is not None:
-                    self.mqtt_plugin.mqtt_client.subscribe('homeassistant/status', qos=1)
-                    self._publish_homeassistant_discovery(force=True)
+                    # Discovery messages are retained, so a missed status message does not leave Home Assistant without them
+                    self.mqtt_plugin.mqtt_client.subscribe(self._status_topic, qos=0)
+                    # All discovery messages are published now, this includes changes scheduled before or while the connection was lost
+                    self._cancel_pending_discovery()
+                    # If the broker kept the session it also kept the retained discovery messages, then only changed messages are published.
+                    # Home Assistant restarts are handled by its status message.
+                    self._publish_homeassistant_discovery(force=not getattr(flags, 'session_present', False))
             # send extra topics after connection
             for vehicle in self.car_connectivity.garage.list_vehicles():
                 if vehicle.enabled:
-                    if vehicle.position.enabled and vehicle.position.latitude.enabled and vehicle.position.latitude.value is not None \
-                            and vehicle.position.longitude.enabled and vehicle.position.longitude.value is not None:
+                    if vehicle.position.enabled and _has_value(vehicle.position.latitude) and _has_value(vehicle.position.longitude):
                         self.__send_position_extra_targets(vehicle.position)
-                    if isinstance(vehicle, ElectricVehicle) and vehicle.charging.state.enabled and vehicle.charging.state.value is not None:
+                    if isinstance(vehicle, ElectricVehicle) and _has_value(vehicle.charging.state):
                         self.__send_charging_binary_state(vehicle.charging.state)
-                    if vehicle.climatization.state.enabled and vehicle.climatization.state.value is not None:
+                    if _has_value(vehicle.climatization.state):
                         self.__send_climatization_binary_state(vehicle.climatization.state)
                         self.__send_climatization_hvac_topics(vehicle.climatization.state)